@@ -1,109 +1,529 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
+import json
+import os
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict, namedtuple
+from datetime import datetime
+
+DONE_PREFIX = "✔️ "
+# Fold the journal into a new snapshot once it holds this many operations,
+# or more operations than there are tasks, so compaction stays amortized O(1)
+COMPACT_OPS = 5000
+
+Task = namedtuple("Task", "id text done created done_at")
+
+SETTINGS_FILE = "todo_settings.json"
+# Colour palettes; each becomes a ttk theme once at startup
+THEMES = {
+    "light": {"background": "#ffffff", "foreground": "#000000", "field": "#ffffff",
+              "button": "#e6e6e6", "active": "#d0d0d0", "select": "#cccccc", "border": "#b0b0b0"},
+    "dark": {"background": "#2e2e2e", "foreground": "#ffffff", "field": "#3a3a3a",
+             "button": "#444444", "active": "#555555", "select": "#444444", "border": "#1e1e1e"},
+}
+
+def now():
+    return datetime.now().isoformat(timespec="seconds")
+
+class TaskStore:
+    # Tasks live in a snapshot (tasks.snapshot.json) plus an append-only
+    # journal of operations since then (tasks.journal, one JSON object per
+    # line). Every add, done and delete is one appended line, flushed and
+    # optionally fsynced. Each operation carries a sequence number and the
+    # snapshot records the last one it includes, so a crash between writing
+    # the snapshot and emptying the journal never applies an operation twice.
+    def __init__(self, path="tasks", legacy_file="tasks.txt", fsync=True):
+        self.snapshot_path = path + ".snapshot.json"
+        self.journal_path = path + ".journal"
+        self.fsync = fsync
+        self.tasks = {}
+        self.next_id = 1
+        self.seq = 0
+        self.journal_ops = 0
+        self.load()
+        if not self.tasks and self.seq == 0 and legacy_file and os.path.exists(legacy_file):
+            self.import_legacy(legacy_file)
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def load(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+            self.next_id = snapshot["next_id"]
+            self.seq = snapshot["seq"]
+            self.tasks = {task[0]: Task(*task) for task in snapshot["tasks"]}
+        if os.path.exists(self.journal_path):
+            good = 0
+            with open(self.journal_path, "rb") as file:
+                for line in file:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break
+                    good += len(line)
+                    if op["seq"] > self.seq:
+                        self.apply(op)
+                        self.journal_ops += 1
+            # Drop a torn last line left by a crash so new operations follow a full line
+            if good < os.path.getsize(self.journal_path):
+                os.truncate(self.journal_path, good)
+
+    def import_legacy(self, legacy_file):
+        # One-time move from tasks.txt, where done tasks carry a prefix
+        with open(legacy_file, encoding="utf-8") as file:
+            for line in file:
+                text = line.strip()
+                if not text:
+                    continue
+                done = text.startswith(DONE_PREFIX)
+                if done:
+                    text = text[len(DONE_PREFIX):]
+                created = now()
+                self.tasks[self.next_id] = Task(self.next_id, text, done, created, created if done else None)
+                self.next_id += 1
+        self.write_snapshot()
+
+    def apply(self, op):
+        self.seq = op["seq"]
+        kind = op["op"]
+        if kind == "add":
+            self.tasks[op["id"]] = Task(op["id"], op["text"], False, op["ts"], None)
+            self.next_id = max(self.next_id, op["id"] + 1)
+        elif kind == "done" and op["id"] in self.tasks:
+            self.tasks[op["id"]] = self.tasks[op["id"]]._replace(done=True, done_at=op["ts"])
+        elif kind == "delete":
+            self.tasks.pop(op["id"], None)
+
+    def log(self, **op):
+        op["seq"] = self.seq + 1
+        self.journal.write(json.dumps(op, ensure_ascii=False) + "\n")
+        self.journal.flush()
+        if self.fsync:
+            os.fsync(self.journal.fileno())
+        self.apply(op)
+        self.journal_ops += 1
+        if self.journal_ops >= max(COMPACT_OPS, len(self.tasks)):
+            self.compact()
+
+    def add(self, text):
+        task_id = self.next_id
+        self.log(op="add", id=task_id, text=text, ts=now())
+        return self.tasks[task_id]
+
+    def mark_done(self, task_id):
+        if task_id in self.tasks and not self.tasks[task_id].done:
+            self.log(op="done", id=task_id, ts=now())
+        return self.tasks.get(task_id)
+
+    def delete(self, task_id):
+        if task_id in self.tasks:
+            self.log(op="delete", id=task_id)
+
+    def __iter__(self):
+        return iter(self.tasks.values())
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def write_snapshot(self):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"next_id": self.next_id, "seq": self.seq, "tasks": list(self.tasks.values())}, file,
+                      ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def compact(self):
+        # New snapshot first, then start an empty journal
+        self.write_snapshot()
+        self.journal.close()
+        self.journal = open(self.journal_path, "w", encoding="utf-8")
+        self.journal_ops = 0
+
+    def close(self):
+        self.journal.close()
+
+def tokenize(text):
+    return re.findall(r"\w+", text.lower())
+
+class TaskModel:
+    # In-memory indexes over a TaskStore, kept in step with every write:
+    # task ids by done flag and by lower-cased word, plus every task in text
+    # order. A search word matches any indexed word containing it, found by
+    # scanning the vocabulary rather than every task's text; a word that
+    # matches much of the vocabulary (one or two letters) is cheaper to find
+    # by scanning the texts, which gives the same answer because search words
+    # never span two indexed words.
+    SORTS = ("added", "text", "status")
+
+    def __init__(self, store):
+        self.store = store
+        self.by_status = {False: set(), True: set()}
+        self.words = defaultdict(set)
+        self.texts = {}
+        self.by_text = []
+        # search word -> matching vocabulary words, so each keystroke only
+        # rescans the matches for the word as it was one character ago
+        self.matches = {}
+        for task in store:
+            self.index(task)
+        self.by_text.sort()
+
+    def index(self, task):
+        text = self.texts[task.id] = task.text.lower()
+        self.by_status[task.done].add(task.id)
+        for word in set(tokenize(text)):
+            self.words[word].add(task.id)
+        self.by_text.append((text, task.id))
+
+    def unindex(self, task):
+        text = self.texts.pop(task.id)
+        self.by_status[task.done].discard(task.id)
+        for word in set(tokenize(text)):
+            ids = self.words[word]
+            ids.discard(task.id)
+            if not ids:
+                del self.words[word]
+        del self.by_text[bisect_left(self.by_text, (text, task.id))]
+
+    def __len__(self):
+        return len(self.store)
+
+    def get(self, task_id):
+        return self.store.tasks.get(task_id)
+
+    def add(self, text):
+        task = self.store.add(text)
+        self.index(task)
+        # index() appended it; move it to its place in text order
+        self.by_text.pop()
+        insort(self.by_text, (self.texts[task.id], task.id))
+        self.matches.clear()
+        return task
+
+    def mark_done(self, task_id):
+        task = self.store.tasks.get(task_id)
+        if task and not task.done:
+            self.by_status[False].discard(task_id)
+            self.by_status[True].add(task_id)
+            task = self.store.mark_done(task_id)
+        return task
+
+    def delete(self, task_id):
+        task = self.store.tasks.get(task_id)
+        if task:
+            self.unindex(task)
+            self.store.delete(task_id)
+            self.matches.clear()
+
+    def matching_words(self, word):
+        matches = self.matches.get(word)
+        if matches is None:
+            candidates = self.matches.get(word[:-1], self.words)
+            matches = [indexed for indexed in candidates if word in indexed]
+            if len(self.matches) > 256:
+                self.matches.clear()
+            self.matches[word] = matches
+        return matches
+
+    def containing(self, word):
+        matches = self.matching_words(word)
+        if len(matches) == 1:
+            return self.words.get(matches[0], set())
+        if len(matches) > len(self.texts) // 8:
+            return {task_id for task_id, text in self.texts.items() if word in text}
+        return set().union(*(self.words.get(match, ()) for match in matches))
+
+    def search(self, query="", done=None, sort="added"):
+        # Ids of the tasks holding every word of query (as a substring of one
+        # of their words), limited to done or pending tasks unless done is None
+        selections = [] if done is None else [self.by_status[done]]
+        selections += [self.containing(word) for word in set(tokenize(query))]
+        if selections:
+            selections.sort(key=len)
+            ids = selections[0].intersection(*selections[1:])
+        else:
+            ids = self.texts.keys()
+        if sort == "text":
+            if len(ids) == len(self.texts):
+                return [task_id for text, task_id in self.by_text]
+            if len(ids) > len(self.texts) // 8:
+                return [task_id for text, task_id in self.by_text if task_id in ids]
+            return sorted(sorted(ids), key=self.texts.__getitem__)
+        if sort == "status":
+            return sorted(self.by_status[False].intersection(ids)) + sorted(self.by_status[True].intersection(ids))
+        # Ids grow with every add, so id order is the order tasks were added
+        return sorted(ids)
+
+class VirtualList:
+    # A Listbox that only ever holds the visible rows of a long list of ids.
+    # Scrolling re-renders those rows from format_row, so showing or
+    # filtering 100k tasks costs the same as showing ten.
+    def __init__(self, parent, format_row, height=10, **options):
+        self.format_row = format_row
+        self.height = height
+        self.ids = []
+        self.top = 0
+        self.selected = None
+        self.frame = ttk.Frame(parent)
+        self.listbox = tk.Listbox(self.frame, height=height, exportselection=False, **options)
+        self.scrollbar = ttk.Scrollbar(self.frame, command=self.yview)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", lambda event: self.scroll(-3 if event.delta > 0 else 3))
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))
+
+    def pack(self, **options):
+        self.frame.pack(**options)
+
+    def set_rows(self, ids):
+        self.ids = ids
+        # A row the filter hid is no longer selected, actions must not reach it
+        if self.selected is not None and self.selected not in ids:
+            self.selected = None
+        self.top = max(0, min(self.top, len(ids) - self.height))
+        self.render()
+
+    def render(self):
+        rows = self.ids[self.top:self.top + self.height]
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *map(self.format_row, rows))
+        if self.selected in rows:
+            self.listbox.selection_set(rows.index(self.selected))
+        if self.ids:
+            self.scrollbar.set(self.top / len(self.ids), (self.top + len(rows)) / len(self.ids))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, rows):
+        top = max(0, min(self.top + rows, len(self.ids) - self.height))
+        if top != self.top:
+            self.top = top
+            self.render()
+        return "break"
+
+    def yview(self, action, amount, unit=None):
+        if action == "moveto":
+            return self.scroll(int(float(amount) * len(self.ids)) - self.top)
+        return self.scroll(int(amount) * (self.height if unit == "pages" else 1))
+
+    def on_select(self, event):
+        selected = self.listbox.curselection()
+        if selected:
+            self.selected = self.ids[self.top + selected[0]]
+
+def load_settings(path=SETTINGS_FILE):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_settings(settings, path=SETTINGS_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(settings, file, indent=2)
+    os.replace(tmp_path, path)
+
+class ThemeManager:
+    # Every palette in THEMES is turned into a ttk theme up front, so
+    # switching is one Style.theme_use() call whatever the number of ttk
+    # widgets. The few classic Tk widgets without a ttk version (the root
+    # window, the task Listbox, option menus) are registered once with the
+    # palette colours they take.
+    def __init__(self, root, themes=THEMES):
+        self.root = root
+        self.themes = themes
+        self.style = ttk.Style(root)
+        self.classic = []
+        self.current = None
+        for name, palette in themes.items():
+            if self.theme_name(name) not in self.style.theme_names():
+                self.style.theme_create(self.theme_name(name), parent="clam", settings=self.settings(palette))
+
+    def theme_name(self, name):
+        return "todo-" + name
+
+    def settings(self, palette):
+        button = {
+            "configure": {"background": palette["button"], "foreground": palette["foreground"],
+                          "bordercolor": palette["border"], "padding": 4},
+            "map": {"background": [("active", palette["active"])]},
+        }
+        return {
+            ".": {"configure": {"background": palette["background"], "foreground": palette["foreground"],
+                                "fieldbackground": palette["field"], "bordercolor": palette["border"],
+                                "troughcolor": palette["background"], "selectbackground": palette["select"],
+                                "selectforeground": palette["foreground"], "insertcolor": palette["foreground"]}},
+            "TButton": button,
+            "TMenubutton": button,
+            "Vertical.TScrollbar": {"configure": {"background": palette["button"],
+                                                  "arrowcolor": palette["foreground"]}},
+            "Header.TLabel": {"configure": {"font": ("Helvetica", 16, "bold")}},
+            "Count.TLabel": {"configure": {"font": ("Helvetica", 9)}},
+        }
+
+    def register(self, widget, **options):
+        # options: widget option -> palette key, e.g. background="field"
+        self.classic.append((widget, options))
+        if self.current:
+            self.configure(widget, options, self.themes[self.current])
+
+    def configure(self, widget, options, palette):
+        widget.configure(**{option: palette[key] for option, key in options.items()})
+
+    def use(self, name):
+        self.style.theme_use(self.theme_name(name))
+        palette = self.themes[name]
+        for widget, options in self.classic:
+            self.configure(widget, options, palette)
+        self.current = name
+
+    def next(self):
+        names = list(self.themes)
+        return names[(names.index(self.current) + 1) % len(names)]
 
 class ToDoApp:
+    STATUSES = {"All": None, "Pending": False, "Done": True}
+    SORTS = {"Added": "added", "A-Z": "text", "Pending first": "status"}
+
     def __init__(self, root):
         self.root = root
         self.root.title("To-Do List App")
-        self.root.geometry("400x500")
+        self.root.geometry("400x620")
         self.root.resizable(False, False)
 
-        self.is_dark = False
         self.task_file = "tasks.txt"
+        self.settings = load_settings()
+        self.themes = ThemeManager(self.root)
+        # Every change is journaled as it happens, no explicit save needed
+        self.store = TaskStore(legacy_file=self.task_file)
+        self.model = TaskModel(self.store)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
         self.create_widgets()
+        theme = self.settings.get("theme")
+        self.themes.use(theme if theme in THEMES else "light")
         self.load_tasks()
 
     def create_widgets(self):
-        self.header = tk.Label(self.root, text="To-Do List", font=("Helvetica", 16, "bold"))
+        self.header = ttk.Label(self.root, text="To-Do List", style="Header.TLabel")
         self.header.pack(pady=10)
 
-        self.task_entry = tk.Entry(self.root, font=("Helvetica", 12), width=25)
+        self.task_entry = ttk.Entry(self.root, font=("Helvetica", 12), width=25)
         self.task_entry.pack(pady=10)
 
-        self.add_button = tk.Button(self.root, text="Add Task", width=20, command=self.add_task)
+        self.add_button = ttk.Button(self.root, text="Add Task", width=20, command=self.add_task)
         self.add_button.pack(pady=5)
 
-        self.task_listbox = tk.Listbox(self.root, font=("Helvetica", 12), width=30, height=10)
-        self.task_listbox.pack(pady=10)
+        # Filter row: search text, status and sort order, applied as you type
+        self.filter_frame = ttk.Frame(self.root)
+        self.filter_frame.pack(pady=5)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.refresh())
+        self.search_entry = ttk.Entry(self.filter_frame, textvariable=self.search_var, font=("Helvetica", 10), width=14)
+        self.search_entry.pack(side=tk.LEFT, padx=2)
+        self.status_var = tk.StringVar(value="All")
+        self.status_menu = ttk.OptionMenu(self.filter_frame, self.status_var, "All", *self.STATUSES,
+                                          command=lambda value: self.refresh())
+        self.status_menu.pack(side=tk.LEFT, padx=2)
+        self.sort_var = tk.StringVar(value="Added")
+        self.sort_menu = ttk.OptionMenu(self.filter_frame, self.sort_var, "Added", *self.SORTS,
+                                        command=lambda value: self.refresh())
+        self.sort_menu.pack(side=tk.LEFT, padx=2)
+
+        self.task_list = VirtualList(self.root, self.format_row, font=("Helvetica", 12), width=30, height=10)
+        self.task_listbox = self.task_list.listbox
+        self.task_list.pack(pady=5)
+        self.count_label = ttk.Label(self.root, style="Count.TLabel")
+        self.count_label.pack()
 
-        self.done_button = tk.Button(self.root, text="Mark as Done", width=20, command=self.mark_done)
+        self.done_button = ttk.Button(self.root, text="Mark as Done", width=20, command=self.mark_done)
         self.done_button.pack(pady=5)
 
-        self.delete_button = tk.Button(self.root, text="Delete Task", width=20, command=self.delete_task)
+        self.delete_button = ttk.Button(self.root, text="Delete Task", width=20, command=self.delete_task)
         self.delete_button.pack(pady=5)
 
-        self.save_button = tk.Button(self.root, text="Save Tasks", width=20, command=self.save_tasks)
+        self.save_button = ttk.Button(self.root, text="Save Tasks", width=20, command=self.save_tasks)
         self.save_button.pack(pady=5)
 
-        self.load_button = tk.Button(self.root, text="Load Tasks", width=20, command=self.load_tasks)
+        self.load_button = ttk.Button(self.root, text="Load Tasks", width=20, command=self.load_tasks)
         self.load_button.pack(pady=5)
 
-        self.theme_button = tk.Button(self.root, text="Toggle Dark Mode", width=20, command=self.toggle_theme)
+        self.theme_button = ttk.Button(self.root, text="Toggle Dark Mode", width=20, command=self.toggle_theme)
         self.theme_button.pack(pady=10)
 
+        # Widgets without a ttk counterpart, coloured from the palette
+        self.themes.register(self.root, background="background")
+        self.themes.register(self.task_listbox, background="field", foreground="foreground",
+                             selectbackground="select", selectforeground="foreground")
+        for menu in (self.status_menu["menu"], self.sort_menu["menu"]):
+            self.themes.register(self.root.nametowidget(menu), background="field", foreground="foreground",
+                                 activebackground="select", activeforeground="foreground")
+
+    def format_task(self, task):
+        return DONE_PREFIX + task.text if task.done else task.text
+
+    def format_row(self, task_id):
+        return self.format_task(self.model.get(task_id))
+
+    def refresh(self):
+        # Re-run the current filter and hand the result to the list
+        ids = self.model.search(self.search_var.get(), self.STATUSES[self.status_var.get()],
+                                self.SORTS[self.sort_var.get()])
+        self.task_list.set_rows(ids)
+        self.count_label.configure(text=f"{len(ids)} of {len(self.model)} tasks")
+
     def add_task(self):
-        task = self.task_entry.get().strip()
-        if task:
-            self.task_listbox.insert(tk.END, task)
+        text = self.task_entry.get().strip()
+        if text:
+            self.task_list.selected = self.model.add(text).id
             self.task_entry.delete(0, tk.END)
+            self.refresh()
         else:
             messagebox.showwarning("Input Error", "Please enter a task.")
 
     def delete_task(self):
-        selected = self.task_listbox.curselection()
-        if selected:
-            self.task_listbox.delete(selected[0])
+        if self.task_list.selected is not None:
+            self.model.delete(self.task_list.selected)
+            self.task_list.selected = None
+            self.refresh()
         else:
             messagebox.showinfo("Delete Task", "Please select a task to delete.")
 
     def mark_done(self):
-        selected = self.task_listbox.curselection()
-        if selected:
-            task = self.task_listbox.get(selected)
-            if not task.startswith("✔️ "):
-                self.task_listbox.delete(selected)
-                self.task_listbox.insert(selected, "✔️ " + task)
+        if self.task_list.selected is not None:
+            self.model.mark_done(self.task_list.selected)
+            self.refresh()
         else:
             messagebox.showinfo("Mark as Done", "Please select a task.")
 
     def save_tasks(self):
+        # Changes are already on disk; this folds the journal into a snapshot
         try:
-            with open(self.task_file, "w") as file:
-                for i in range(self.task_listbox.size()):
-                    file.write(self.task_listbox.get(i) + "\n")
+            self.store.compact()
             messagebox.showinfo("Save", "Tasks saved successfully.")
         except Exception as e:
             messagebox.showerror("Error", f"Could not save tasks.\n{e}")
 
     def load_tasks(self):
-        try:
-            with open(self.task_file, "r") as file:
-                self.task_listbox.delete(0, tk.END)
-                for line in file:
-                    self.task_listbox.insert(tk.END, line.strip())
-        except FileNotFoundError:
-            open(self.task_file, "w").close()  # Create file if not exists
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load tasks.\n{e}")
+        self.refresh()
+
+    def close(self):
+        self.store.close()
+        self.root.destroy()
 
     def toggle_theme(self):
-        self.is_dark = not self.is_dark
-        bg_color = "#2e2e2e" if self.is_dark else "#ffffff"
-        fg_color = "#ffffff" if self.is_dark else "#000000"
-
-        self.root.configure(bg=bg_color)
-        widgets = [
-            self.header, self.task_entry, self.add_button,
-            self.task_listbox, self.done_button,
-            self.delete_button, self.save_button,
-            self.load_button, self.theme_button
-        ]
-
-        for widget in widgets:
-            widget.configure(bg=bg_color, fg=fg_color)
-
-        self.task_listbox.configure(selectbackground="#444" if self.is_dark else "#ccc")
+        self.themes.use(self.themes.next())
+        self.settings["theme"] = self.themes.current
+        try:
+            save_settings(self.settings)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save settings.\n{e}")
 
 # Run the application
 if __name__ == "__main__":
@@ -0,0 +1,2 @@
+# Benchmarks for the apps in this repo, run from the repo root, e.g.
+#   python -m benchmarks.library
@@ -0,0 +1,93 @@
+# Columnar student analytics against plain rows.
+#
+#   python -m benchmarks.analytics --rows 2000000
+#
+# Builds the same synthetic students as a list of tuples ("rows", what a
+# Python loop over the database would use) and as student_analytics columns,
+# then times a filter, a group-by count, mean age per group and an age
+# histogram on both. Memory is measured with tracemalloc while building.
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+
+from student_analytics import StudentColumns
+
+GENDERS = ('Male', 'Female', 'Other')
+DEPARTMENTS = ('CSE', 'ECE', 'EEE', 'MECH', 'CIVIL', 'IT', 'CHEM', 'BIO', 'MATH', 'PHY')
+COLLEGES = tuple(f"College {i}" for i in range(400))
+
+
+def students(rows, seed=1):
+    rng = random.Random(seed)
+    for i in range(1, rows + 1):
+        yield (i, rng.randint(17, 30), rng.choice(GENDERS), rng.choice(DEPARTMENTS), rng.choice(COLLEGES),
+               rng.choice('ABCDE'))
+
+
+def build(make):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = make()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, elapsed, size
+
+
+def make_columns(rows):
+    table = StudentColumns()
+    for student in students(rows):
+        table.append(*student)
+    return table
+
+
+def row_queries(rows):
+    selected = [row for row in rows if row[3] in ('CSE', 'IT') and 18 <= row[1] <= 22]
+    counts = Counter(row[3] for row in selected)
+    sums, totals = defaultdict(int), Counter()
+    for row in selected:
+        sums[row[4]] += row[1]
+        totals[row[4]] += 1
+    means = {college: sums[college] / totals[college] for college in totals}
+    histogram = Counter(row[1] for row in selected)
+    return len(selected), counts, means, histogram
+
+
+def column_queries(table):
+    mask = table.where(department=['CSE', 'IT'], age=(18, 22))
+    return (table.count(mask), table.group_count('department', mask), table.group_mean_age('college', mask),
+            table.age_histogram(mask))
+
+
+def best_of(fn, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2000000)
+    args = parser.parse_args()
+
+    rows, rows_build, rows_size = build(lambda: list(students(args.rows)))
+    table, table_build, table_size = build(lambda: make_columns(args.rows))
+    (row_count, *_), row_query = best_of(lambda: row_queries(rows))
+    (column_count, *_), column_query = best_of(lambda: column_queries(table))
+    assert row_count == column_count
+
+    print(f"{args.rows} students, {column_count} match department in (CSE, IT) and age 18-22")
+    print(f"{'layout':<10}{'build s':>10}{'memory MB':>12}{'queries ms':>12}")
+    print(f"{'rows':<10}{rows_build:>10.2f}{rows_size / 1e6:>12.1f}{row_query * 1000:>12.1f}")
+    print(f"{'columns':<10}{table_build:>10.2f}{table_size / 1e6:>12.1f}{column_query * 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# Synthetic library database for the benchmarks.
+#
+#   python -m benchmarks.datagen --db bench.db --books 1000000 --borrowers 100000 --loans 3000000
+#
+# Builds the current schema through library_management, then bulk loads
+# books, borrowers and a circulation history with executemany in large
+# transactions. The same --seed always produces the same database.
+
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+import library_management as lm
+
+WORDS = ("river", "garden", "shadow", "empire", "python", "silent", "winter", "glass", "atlas", "harbor",
+         "stone", "quantum", "memory", "northern", "paper", "crimson", "island", "machine", "letters", "orbit")
+FIRST_NAMES = ("Asha", "Ben", "Chen", "Dana", "Elif", "Farah", "Goran", "Hana", "Ivan", "Jun", "Kofi", "Lena")
+LAST_NAMES = ("Rao", "Smith", "Okafor", "Garcia", "Novak", "Sato", "Müller", "Haddad", "Kim", "Silva")
+
+
+def books(rng, count):
+    for i in range(count):
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+        author = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        yield title, author, f"978{i:010d}", rng.randint(1, 5), rng.randint(1900, 2024)
+
+
+def borrowers(rng, count):
+    for i in range(count):
+        yield f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}", f"555-{i:07d}"
+
+
+def loans(rng, count, book_count, borrower_count, days, open_share):
+    today = date.today()
+    # Loans come in issue order, the newest ones are the ones still open
+    for i in range(count):
+        issued = today - timedelta(days=days - days * i // max(1, count))
+        due = issued + timedelta(days=14)
+        open_loan = i >= count * (1 - open_share)
+        returned = None if open_loan else issued + timedelta(days=rng.randint(1, 21))
+        yield (rng.randint(1, book_count), rng.randint(1, borrower_count), issued.isoformat(), due.isoformat(),
+               0 if open_loan else 1, returned.isoformat() if returned else None)
+
+
+def insert(conn, sql, rows, chunk_size):
+    total = 0
+    for chunk in lm._chunks(rows, chunk_size):
+        with lm.transaction(conn):
+            conn.executemany(sql, chunk)
+        total += len(chunk)
+    return total
+
+
+def generate(db_name, book_count, borrower_count, loan_count, days=3 * 365, open_share=0.05, seed=1,
+             chunk_size=50000):
+    rng = random.Random(seed)
+    if os.path.exists(db_name):
+        raise FileExistsError(f"{db_name} already exists")
+    lm.configure_db(db_name)
+    timings = {}
+    with lm.get_pool().connection() as conn:
+        start = time.perf_counter()
+        insert(conn, 'INSERT INTO books (title, author, isbn, quantity, year) VALUES (?, ?, ?, ?, ?)',
+               books(rng, book_count), chunk_size)
+        timings['books'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        insert(conn, 'INSERT INTO borrowers (name, contact) VALUES (?, ?)', borrowers(rng, borrower_count), chunk_size)
+        timings['borrowers'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        insert(conn,
+               'INSERT INTO issued (book_id, borrower_id, issue_date, due_date, returned, returned_date) '
+               'VALUES (?, ?, ?, ?, ?, ?)',
+               loans(rng, loan_count, book_count, borrower_count, days, open_share), chunk_size)
+        with lm.transaction(conn):
+            lm.rebuild_stats(conn)
+        conn.execute('ANALYZE')
+        timings['loans'] = time.perf_counter() - start
+    lm.close_db()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', required=True, help="database file to create")
+    parser.add_argument('--books', type=int, default=100000)
+    parser.add_argument('--borrowers', type=int, default=10000)
+    parser.add_argument('--loans', type=int, default=300000)
+    parser.add_argument('--days', type=int, default=3 * 365, help="span of the loan history")
+    parser.add_argument('--open-share', type=float, default=0.05, help="fraction of loans still open")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    timings = generate(args.db, args.books, args.borrowers, args.loans, args.days, args.open_share, args.seed)
+    for table, seconds in timings.items():
+        print(f"{table:<10}{seconds:>8.1f}s")
+
+
+if __name__ == '__main__':
+    main()
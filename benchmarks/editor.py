@@ -0,0 +1,112 @@
+# Open time and keystroke latency of the texteditor TextBuffer on a large file.
+#
+#   python -m benchmarks.editor --size-mb 1024
+#
+# Writes a file of short lines, then times: opening it, reading the first
+# window, single-byte inserts and deletes at random offsets, a typing run,
+# undo/redo, and both save paths (in place after an overwrite, streamed
+# rewrite after an insert). "naive" reads the whole file into memory and
+# splices bytes, as a Listbox/Text-only editor would; it is skipped for
+# files over --naive-limit-mb.
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import texteditor
+
+
+def make_file(path, size):
+    line = b"The quick brown fox jumps over the lazy dog, again and again.\n"
+    block = line * (1024 * 1024 // len(line))
+    with open(path, 'wb') as file:
+        written = 0
+        while written < size:
+            written += file.write(block[:size - written])
+
+
+def latency(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e6, samples[int(len(samples) * 0.99)] * 1e6
+
+
+def report(name, p50_us, p99_us):
+    print(f"{name:<28}{p50_us:>12.1f}{p99_us:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=1024)
+    parser.add_argument('--edits', type=int, default=10000, help="random edits to time")
+    parser.add_argument('--naive-limit-mb', type=int, default=256)
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'large.txt')
+        make_file(path, args.size_mb * 1024 * 1024)
+
+        start = time.perf_counter()
+        buffer = texteditor.TextBuffer.open(path)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        buffer.read(0, texteditor.WINDOW_BYTES)
+        first_window = time.perf_counter() - start
+        print(f"{args.size_mb} MB file: open {opened * 1000:.2f} ms, first window {first_window * 1000:.2f} ms")
+
+        print(f"{'operation':<28}{'p50 us':>12}{'p99 us':>12}")
+        report('insert at random offset', *latency(lambda: buffer.insert(rng.randrange(len(buffer)), b'x'),
+                                                   args.edits))
+        report('delete at random offset', *latency(lambda: buffer.delete(rng.randrange(len(buffer)), 1),
+                                                   args.edits))
+        typing_at = [len(buffer) // 2]
+
+        def type_key():
+            buffer.insert(typing_at[0], b'y')
+            typing_at[0] += 1
+        report('typing run', *latency(type_key, args.edits))
+        report('read window at random', *latency(
+            lambda: buffer.read(rng.randrange(len(buffer)), texteditor.WINDOW_BYTES), 200))
+        report('undo + redo', *latency(lambda: (buffer.undo(), buffer.redo()), 1000))
+        pieces = sum(1 for _ in buffer.pieces())
+        print(f"{pieces} pieces, {len(buffer.undo_stack)} undo steps")
+        buffer.close()
+
+        def overwrite(buffer):
+            middle = len(buffer) // 2
+            buffer.delete(middle, 5)
+            buffer.insert(middle, b'HELLO')
+
+        # Save paths, each on a fresh copy of the file
+        for name, edit in (('overwrite', overwrite), ('insert', lambda b: b.insert(len(b) // 2, b'HELLO'))):
+            make_file(path, args.size_mb * 1024 * 1024)
+            buffer = texteditor.TextBuffer.open(path)
+            edit(buffer)
+            start = time.perf_counter()
+            how, written = buffer.save()
+            print(f"save after {name}: {how}, {written} bytes in {(time.perf_counter() - start) * 1000:.1f} ms")
+            buffer.close()
+
+        if args.size_mb <= args.naive_limit_mb:
+            start = time.perf_counter()
+            with open(path, 'rb') as file:
+                data = file.read()
+            naive_open = time.perf_counter() - start
+
+            def naive_insert():
+                nonlocal data
+                pos = rng.randrange(len(data))
+                data = data[:pos] + b'x' + data[pos:]
+            print(f"naive: open {naive_open * 1000:.1f} ms")
+            report('naive insert', *latency(naive_insert, 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+# Per-operation latency of the library data layer.
+#
+#   python -m benchmarks.library --ops 500
+#
+# "legacy" reproduces the old behaviour (new connection, schema DDL and commit on
+# every call), "pooled" goes through the connection pool in library_management.
+#
+#   python -m benchmarks.library --ui-stress 5
+#
+# Hammers get_issued_books() for a few seconds and reports how late Tk timer
+# ticks fire, once with the queries on the Tk thread and once through DbWorker.
+# Without a display it runs on a bare Tcl interpreter, which has the same timers.
+#
+#   python -m benchmarks.library --contention 8
+#
+# Several processes issue and return copies of a handful of books in one shared
+# database file. Reports issues per second and checks that, for every book,
+# copies on the shelf plus open loans still add up to the starting stock.
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import library_management as lm
+
+
+def legacy_connect(db_name):
+    conn = sqlite3.connect(db_name)
+    for statement in lm.SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+
+def legacy_ops(db_name):
+    def add_book(title, author, isbn, quantity):
+        conn = legacy_connect(db_name)
+        conn.execute('INSERT INTO books (title, author, isbn, quantity) VALUES (?, ?, ?, ?)',
+                     (title, author, isbn, quantity))
+        conn.commit()
+        conn.close()
+
+    def get_books():
+        conn = legacy_connect(db_name)
+        rows = conn.execute('SELECT * FROM books').fetchall()
+        conn.close()
+        return rows
+
+    def add_borrower(name, contact):
+        conn = legacy_connect(db_name)
+        conn.execute('INSERT INTO borrowers (name, contact) VALUES (?, ?)', (name, contact))
+        conn.commit()
+        conn.close()
+
+    def issue_book(book_id, borrower_id, issue_date, due_date):
+        conn = legacy_connect(db_name)
+        quantity = conn.execute('SELECT quantity FROM books WHERE id=?', (book_id,)).fetchone()[0]
+        if quantity <= 0:
+            conn.close()
+            return False, "Book not available for issue"
+        conn.execute('INSERT INTO issued (book_id, borrower_id, issue_date, due_date) VALUES (?, ?, ?, ?)',
+                     (book_id, borrower_id, issue_date, due_date))
+        conn.execute('UPDATE books SET quantity = quantity - 1 WHERE id=?', (book_id,))
+        conn.commit()
+        conn.close()
+        return True, "Book issued successfully"
+
+    def return_book(issue_id):
+        conn = legacy_connect(db_name)
+        conn.execute('UPDATE issued SET returned=1 WHERE id=?', (issue_id,))
+        book_id = conn.execute('SELECT book_id FROM issued WHERE id=?', (issue_id,)).fetchone()[0]
+        conn.execute('UPDATE books SET quantity = quantity + 1 WHERE id=?', (book_id,))
+        conn.commit()
+        conn.close()
+
+    return {
+        'add_book': add_book,
+        'get_books': get_books,
+        'add_borrower': add_borrower,
+        'issue_book': issue_book,
+        'return_book': return_book,
+    }
+
+
+def pooled_ops(db_name):
+    lm.configure_db(db_name)
+    return {
+        'add_book': lm.add_book,
+        'get_books': lm.get_books,
+        'add_borrower': lm.add_borrower,
+        'issue_book': lm.issue_book,
+        'return_book': lm.return_book,
+    }
+
+
+def timed(fn, calls):
+    start = time.perf_counter()
+    for args in calls:
+        fn(*args)
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+def run(ops, n):
+    results = {}
+    results['add_book'] = timed(ops['add_book'], [(f"Title {i}", "Author", f"isbn-{i}", 5) for i in range(n)])
+    results['add_borrower'] = timed(ops['add_borrower'], [(f"Borrower {i}", "555") for i in range(n)])
+    results['get_books'] = timed(ops['get_books'], [()] * max(1, n // 10))
+    results['issue_book'] = timed(ops['issue_book'],
+                                  [(i % n + 1, i % n + 1, "2024-01-01", "2024-01-08") for i in range(n)])
+    results['return_book'] = timed(ops['return_book'], [(i + 1,) for i in range(n)])
+    return results
+
+
+def fill_loans(db_name, books, borrowers, loans):
+    conn = sqlite3.connect(db_name)
+    for statement in lm.SCHEMA:
+        conn.execute(statement)
+    conn.executemany('INSERT INTO books (title, author, isbn, quantity) VALUES (?, ?, ?, ?)',
+                     ((f"Title {i}", "Author", f"isbn-{i}", 5) for i in range(books)))
+    conn.executemany('INSERT INTO borrowers (name, contact) VALUES (?, ?)',
+                     ((f"Borrower {i}", "555") for i in range(borrowers)))
+    conn.executemany('INSERT INTO issued (book_id, borrower_id, issue_date, due_date) VALUES (?, ?, ?, ?)',
+                     ((i % books + 1, i % borrowers + 1, "2024-01-01", "2024-01-08") for i in range(loans)))
+    conn.commit()
+    conn.close()
+
+
+def tick_lag(root, seconds, load):
+    # Schedules a 10 ms timer over and over and records how late each one fires
+    lags = []
+    interval = 0.010
+    deadline = time.perf_counter() + seconds
+    state = {'expected': time.perf_counter() + interval, 'running': True}
+
+    def tick():
+        now = time.perf_counter()
+        lags.append(max(0.0, now - state['expected']))
+        if now < deadline:
+            # The next tick is due one interval from now; time spent in load()
+            # on this thread shows up as lag
+            state['expected'] = now + interval
+            root.after(int(interval * 1000), tick)
+            load()
+        else:
+            state['running'] = False
+
+    root.after(int(interval * 1000), tick)
+    # Our own event loop: mainloop() returns at once on a Tcl interpreter without Tk
+    while state['running']:
+        root.tk.dooneevent()
+    lags.sort()
+    return len(lags), lags[len(lags) // 2] * 1000, lags[int(len(lags) * 0.99)] * 1000, lags[-1] * 1000
+
+
+def ui_stress(seconds):
+    import tkinter as tk
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, 'stress.db')
+        fill_loans(db_name, 20000, 5000, 200000)
+        lm.configure_db(db_name)
+        display = True
+        try:
+            root = tk.Tk()
+            root.withdraw()
+        except tk.TclError:
+            display = False
+            # No display: timers and after() polling only need the Tcl event loop
+            print("no display, running on a Tcl interpreter without Tk")
+            root = tk.Tcl()
+        worker = lm.DbWorker(root)
+        delivered = []
+        results = {
+            'tk thread': tick_lag(root, seconds, lm.get_issued_books),
+            'DbWorker': tick_lag(root, seconds, lambda: worker.submit(lm.get_issued_books, key='refresh',
+                                                                      on_done=delivered.append)),
+        }
+        # Let the last request finish so its result is delivered
+        deadline = time.perf_counter() + 30
+        while worker.busy and time.perf_counter() < deadline:
+            root.tk.dooneevent()
+        worker.shutdown()
+        if display:
+            root.destroy()
+        lm.close_db()
+
+    print(f"{'queries on':<12}{'ticks':>8}{'p50 lag ms':>12}{'p99 lag ms':>12}{'max lag ms':>12}")
+    for name, (ticks, p50, p99, worst) in results.items():
+        print(f"{name:<12}{ticks:>8}{p50:>12.1f}{p99:>12.1f}{worst:>12.1f}")
+    print(f"DbWorker delivered {len(delivered)} results, {worker.busy} still in flight")
+
+
+CONTENTION_BOOKS = 10
+CONTENTION_STOCK = 3
+
+
+def contention_worker(db_name, legacy, seconds, borrower_id, results):
+    if legacy:
+        ops = legacy_ops(db_name)
+    else:
+        ops = pooled_ops(db_name)
+    conn = sqlite3.connect(db_name, timeout=30)
+    issued = returned = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        book_id = random.randint(1, CONTENTION_BOOKS)
+        try:
+            if random.random() < 0.6:
+                ok, _ = ops['issue_book'](book_id, borrower_id, "2024-01-01", "2024-01-08")
+                issued += ok
+            else:
+                # Pick any open loan of the book, other processes may race us for it
+                row = conn.execute('SELECT id FROM issued WHERE book_id=? AND returned=0 LIMIT 1',
+                                   (book_id,)).fetchone()
+                if row:
+                    result = ops['return_book'](row[0])
+                    returned += result is None or result[0]
+        except sqlite3.OperationalError:
+            errors += 1
+    conn.close()
+    if not legacy:
+        lm.close_db()
+    results.put((issued, returned, errors))
+
+
+def contention(processes, seconds):
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'implementation':<16}{'issues/s':>10}{'returns/s':>11}{'errors':>8}{'bad books':>11}")
+    for legacy in (True, False):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_name = os.path.join(tmp, 'contention.db')
+            conn = sqlite3.connect(db_name)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.close()
+            fill_loans(db_name, CONTENTION_BOOKS, processes, 0)
+            conn = sqlite3.connect(db_name)
+            conn.execute('UPDATE books SET quantity=?', (CONTENTION_STOCK,))
+            conn.commit()
+
+            results = ctx.Queue()
+            workers = [ctx.Process(target=contention_worker, args=(db_name, legacy, seconds, i + 1, results))
+                       for i in range(processes)]
+            for worker in workers:
+                worker.start()
+            totals = [sum(t) for t in zip(*(results.get() for _ in workers))]
+            for worker in workers:
+                worker.join()
+
+            # Every copy is either on the shelf or out on exactly one open loan
+            bad = conn.execute('''
+                SELECT COUNT(*) FROM books
+                WHERE quantity < 0 OR quantity + (SELECT COUNT(*) FROM issued
+                                                  WHERE issued.book_id = books.id AND returned = 0) != ?
+            ''', (CONTENTION_STOCK,)).fetchone()[0]
+            conn.close()
+
+        name = 'legacy' if legacy else 'transactional'
+        print(f"{name:<16}{totals[0] / seconds:>10.0f}{totals[1] / seconds:>11.0f}{totals[2]:>8}{bad:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ops', type=int, default=300, help="calls per operation")
+    parser.add_argument('--ui-stress', type=float, metavar='SECONDS',
+                        help="measure Tk event loop lag under heavy queries instead")
+    parser.add_argument('--contention', type=int, metavar='PROCESSES',
+                        help="run the multi-process issue/return contention benchmark instead")
+    parser.add_argument('--seconds', type=float, default=5.0, help="duration of the contention run")
+    args = parser.parse_args()
+
+    if args.ui_stress:
+        ui_stress(args.ui_stress)
+        return
+    if args.contention:
+        contention(args.contention, args.seconds)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = run(legacy_ops(os.path.join(tmp, 'legacy.db')), args.ops)
+        pooled = run(pooled_ops(os.path.join(tmp, 'pooled.db')), args.ops)
+        stats = lm.cache_stats()
+        lm.close_db()
+
+    print(f"{'operation':<14}{'legacy us/op':>14}{'pooled us/op':>14}{'speedup':>10}")
+    for name in legacy:
+        print(f"{name:<14}{legacy[name]:>14.1f}{pooled[name]:>14.1f}{legacy[name] / pooled[name]:>9.1f}x")
+    print(f"read cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+# Scenario benchmarks for the library data layer, with JSON output.
+#
+#   python -m benchmarks.datagen --db bench.db --books 1000000 --loans 3000000
+#   python -m benchmarks.scenarios --db bench.db --out before.json
+#   python -m benchmarks.scenarios --db bench.db --compare before.json
+#
+# Each scenario runs against a scratch copy of the database (unless --in-place),
+# so every run starts from the same data. --compare exits with status 1 when a
+# scenario got slower than the baseline by more than --threshold percent.
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import library_management as lm
+
+PAGE = 100
+
+
+def percentile(samples, share):
+    return samples[min(len(samples) - 1, int(len(samples) * share))]
+
+
+def measure(ops):
+    # ops: iterable of callables, one timed sample per call
+    samples = []
+    start = time.perf_counter()
+    for op in ops:
+        began = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return {
+        'ops': len(samples),
+        'ops_per_s': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(samples, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+        'max_ms': round(samples[-1] * 1000, 3),
+    }
+
+
+# --- SCENARIOS ---
+
+def catalog_load(rng, ops):
+    # Open the catalog, jump around the scrollbar, then scroll on from the last row
+    def step():
+        lm._cache.reset()
+        total = lm.count_books()
+        rows = lm.get_books_page(PAGE, rng.randrange(max(1, total - PAGE)))
+        if rows:
+            lm.get_books_page(PAGE, after_id=rows[-1][0])
+    return measure(step for _ in range(ops))
+
+
+def issue_storm(rng, ops):
+    book_count = lm.count_books()
+    borrower_count = lm.count_borrowers()
+    today = date.today()
+    due = (today + timedelta(days=14)).isoformat()
+    return measure(lambda: lm.issue_book(rng.randint(1, book_count), rng.randint(1, borrower_count),
+                                         today.isoformat(), due)
+                   for _ in range(ops))
+
+
+def return_storm(rng, ops):
+    with lm.get_pool().connection() as conn:
+        open_ids = [row[0] for row in conn.execute('SELECT id FROM issued WHERE returned=0 LIMIT ?', (ops * 4,))]
+    ids = rng.sample(open_ids, min(ops, len(open_ids)))
+    return measure(lambda issue_id=issue_id: lm.return_book(issue_id) for issue_id in ids)
+
+
+def issued_refresh(rng, ops):
+    # What the Issue tab does on open: total, a window of rows, the overdue list
+    def step():
+        total = lm.count_issued()
+        lm.get_issued_page(PAGE, rng.randrange(max(1, total - PAGE)))
+        lm.get_overdue_loans(limit=200)
+    return measure(step for _ in range(ops))
+
+
+def search(rng, ops):
+    from benchmarks.datagen import WORDS
+
+    def step():
+        lm._cache.reset()
+        lm.search_books(rng.choice(WORDS)[:rng.randint(2, 5)], limit=50)
+    return measure(step for _ in range(ops))
+
+
+SCENARIOS = {
+    'catalog_load': catalog_load,
+    'issue_storm': issue_storm,
+    'return_storm': return_storm,
+    'issued_refresh': issued_refresh,
+    'search': search,
+}
+
+
+# --- RUN / COMPARE ---
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(db_name, names, ops, seed):
+    lm.configure_db(db_name)
+    try:
+        sizes = {'books': lm.count_books(), 'borrowers': lm.count_borrowers(), 'issued': lm.count_issued()}
+        results = {}
+        for name in names:
+            results[name] = SCENARIOS[name](random.Random(seed), ops)
+            print(f"{name:<16}" + ''.join(f"{value:>12}" for value in results[name].values()), file=sys.stderr)
+    finally:
+        lm.close_db()
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'sqlite': sqlite3.sqlite_version,
+            'ops': ops,
+            'seed': seed,
+            'sizes': sizes,
+        },
+        'scenarios': results,
+    }
+
+
+def compare(report, baseline, threshold):
+    # Throughput is the headline number; a drop beyond threshold percent is a regression
+    regressions = []
+    for name, result in report['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before or not before['ops_per_s']:
+            continue
+        change = (result['ops_per_s'] - before['ops_per_s']) / before['ops_per_s'] * 100
+        result['change_pct'] = round(change, 1)
+        print(f"{name:<16}{before['ops_per_s']:>12}{result['ops_per_s']:>12}{change:>+10.1f}%", file=sys.stderr)
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--db', required=True, help="database made with benchmarks.datagen")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="run only this scenario (repeatable)")
+    parser.add_argument('--ops', type=int, default=500, help="operations per scenario")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--in-place', action='store_true', help="run on --db itself instead of a copy")
+    parser.add_argument('--out', help="write the JSON report here instead of stdout")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON report of an earlier run")
+    parser.add_argument('--threshold', type=float, default=20.0, help="allowed slowdown in percent")
+    args = parser.parse_args()
+
+    names = args.scenario or list(SCENARIOS)
+    print(f"{'scenario':<16}" + ''.join(f"{name:>12}" for name in ('ops', 'ops/s', 'p50 ms', 'p99 ms', 'max ms')),
+          file=sys.stderr)
+    if args.in_place:
+        report = run(args.db, names, args.ops, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            scratch = os.path.join(tmp, 'scenarios.db')
+            shutil.copyfile(args.db, scratch)
+            report = run(scratch, names, args.ops, args.seed)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"\n{'scenario':<16}{'before':>12}{'after':>12}{'change':>11}", file=sys.stderr)
+        regressions = compare(report, baseline, args.threshold)
+        report['regressions'] = regressions
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
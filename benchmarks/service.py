@@ -0,0 +1,131 @@
+# Load test for library_service.
+#
+#   python -m benchmarks.service --clients 16 --requests 200
+#
+# Starts the service in a subprocess on a scratch database (or uses --port of a
+# running one with --no-spawn), then runs concurrent clients that mix catalog
+# reads, searches and issue/return calls. Reports requests per second and
+# p50/p99 latency, for single calls and for the batch endpoint.
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from library_service import LibraryClient
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            async with LibraryClient(port=port) as client:
+                await client.request('GET', '/health')
+                return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def seed(port, books, borrowers):
+    async with LibraryClient(port=port) as client:
+        for start in range(0, books, 500):
+            await client.batch([('add_book', {'title': f"Title {i}", 'author': f"Author {i % 97}",
+                                              'isbn': f"isbn-{i}", 'quantity': 5})
+                                for i in range(start, min(books, start + 500))])
+        await client.batch([('add_borrower', {'name': f"Borrower {i}", 'contact': "555"})
+                            for i in range(borrowers)])
+
+
+def random_call(books, borrowers):
+    roll = random.random()
+    if roll < 0.4:
+        return 'get_books_page', {'limit': 50, 'offset': random.randrange(books)}
+    if roll < 0.7:
+        return 'search_books', {'text': f"author {random.randrange(97)}", 'limit': 20}
+    if roll < 0.85:
+        return 'issue_book', {'book_id': random.randint(1, books), 'borrower_id': random.randint(1, borrowers),
+                              'issue_date': "2024-01-01", 'due_date': "2024-01-08"}
+    return 'get_open_loans', {}
+
+
+async def client_loop(port, requests, batch_size, books, borrowers, latencies):
+    async with LibraryClient(port=port) as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            if batch_size > 1:
+                await client.batch([random_call(books, borrowers) for _ in range(batch_size)])
+            else:
+                op, args = random_call(books, borrowers)
+                await client.call(op, **args)
+            latencies.append(time.perf_counter() - start)
+
+
+async def load(port, clients, requests, batch_size, books, borrowers):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(port, requests, batch_size, books, borrowers, latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests/s': len(latencies) / elapsed,
+        'calls/s': len(latencies) * batch_size / elapsed,
+        'p50 ms': latencies[len(latencies) // 2] * 1000,
+        'p99 ms': latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+async def run(args, port):
+    await wait_ready(port)
+    if args.seed:
+        await seed(port, args.books, args.borrowers)
+    print(f"{'mode':<10}" + ''.join(f"{name:>12}" for name in ('requests/s', 'calls/s', 'p50 ms', 'p99 ms')))
+    for mode, batch_size in (('single', 1), (f'batch x{args.batch}', args.batch)):
+        result = await load(port, args.clients, args.requests, batch_size, args.books, args.borrowers)
+        print(f"{mode:<10}" + ''.join(f"{value:>12.1f}" for value in result.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200, help="requests per client")
+    parser.add_argument('--batch', type=int, default=10, help="calls per batch request")
+    parser.add_argument('--books', type=int, default=5000)
+    parser.add_argument('--borrowers', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4, help="service worker threads")
+    parser.add_argument('--port', type=int, help="use a service that is already running")
+    args = parser.parse_args()
+
+    if args.port:
+        args.seed = False
+        asyncio.run(run(args, args.port))
+        return
+
+    args.seed = True
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen([sys.executable, '-m', 'library_service', '--db', os.path.join(tmp, 'load.db'),
+                                   '--port', str(port), '--workers', str(args.workers)],
+                                  stdout=subprocess.DEVNULL)
+        try:
+            asyncio.run(run(args, port))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
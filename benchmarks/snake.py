@@ -0,0 +1,81 @@
+# Frame time of snakegame.SnakeGame for long snakes on large boards. Needs a display.
+#
+#   python -m benchmarks.snake --lengths 100 1000 10000
+#
+# The snake is laid out as a serpentine over the bottom of the board and the
+# head runs along the empty top row. "redraw" is the old draw_elements on
+# every tick (delete everything, create every item again), "retained" is
+# render(), which moves the tail rectangle to the head. A frame is one
+# tick() up to update_idletasks().
+
+import argparse
+import time
+import tkinter as tk
+from collections import Counter, deque
+
+import snakegame
+
+
+def serpentine(columns, rows, length, cell_size):
+    # length cells snaking left and right, from row 1 down, head at (0, 1)
+    positions = []
+    for row in range(1, rows):
+        cells = range(columns) if row % 2 else range(columns - 1, -1, -1)
+        for column in cells:
+            positions.append((column * cell_size, row * cell_size))
+            if len(positions) == length:
+                return positions
+    return positions
+
+
+def frames(root, game, positions, redraw, count):
+    game.snake_positions = deque(positions)
+    game.occupied = Counter(positions)
+    # Up out of the body into the empty top row, then along it
+    game.direction = 'Up'
+    game.game_running = True
+    game.draw_elements()
+    root.update()
+    game.__dict__.pop('render', None)
+    if redraw:
+        game.render = game.draw_elements
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        game.tick()
+        root.update_idletasks()
+        samples.append(time.perf_counter() - start)
+        game.direction = 'Right'
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.99)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lengths', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--board', type=int, default=1600, help="board width and height in pixels")
+    parser.add_argument('--cell-size', type=int, default=10)
+    parser.add_argument('--frames', type=int, default=100)
+    args = parser.parse_args()
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("no display, nothing to measure")
+        return
+
+    columns = rows = args.board // args.cell_size
+    game = snakegame.SnakeGame(root, args.board, args.board, args.cell_size)
+    root.after_cancel(game.after_id)
+    count = min(args.frames, columns - 1)
+    print(f"{columns}x{rows} board, {count} frames per run")
+    print(f"{'length':>8}{'mode':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for length in args.lengths:
+        positions = serpentine(columns, rows, length, args.cell_size)
+        for mode in ('redraw', 'retained'):
+            p50, p99 = frames(root, game, positions, mode == 'redraw', count)
+            print(f"{len(positions):>8}{mode:>10}{p50:>10.2f}{p99:>10.2f}")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
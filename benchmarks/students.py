@@ -0,0 +1,96 @@
+# Time to first row for the student list in texteditor.StudentRecordApp.
+#
+#   python -m benchmarks.students --rows 1000000
+#
+# "legacy" is the old show_students: parse the whole CSV and insert every row
+# before Tk gets a chance to draw anything. "streamed" is the students_db scan
+# that hands the listbox one chunk per after() tick. Rows go into a real
+# Listbox when a display is available, otherwise only the parsing and
+# formatting is timed.
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+import students_db
+import texteditor
+
+
+def make_csv(path, rows):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        for i in range(rows):
+            writer.writerow([f"student{i}", 18 + i % 10, "ABCDE"[i % 5]])
+
+
+def open_listbox():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None, None
+    listbox = tk.Listbox(root)
+    listbox.pack()
+    return root, listbox
+
+
+def legacy(path, listbox):
+    start = time.perf_counter()
+    with open(path, newline='') as file:
+        for row in csv.reader(file):
+            line = f"Name: {row[0]}, Age: {row[1]}, Grade: {row[2]}"
+            if listbox is not None:
+                listbox.insert('end', line)
+    if listbox is not None:
+        listbox.update_idletasks()
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def streamed(store, listbox):
+    start = time.perf_counter()
+    first = None
+    for chunk in store.scan(texteditor.SHOW_CHUNK):
+        lines = [texteditor.format_student(student) for student in chunk]
+        if listbox is not None:
+            listbox.insert('end', *lines)
+        if first is None:
+            if listbox is not None:
+                listbox.update_idletasks()
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'students.csv')
+        make_csv(csv_path, args.rows)
+
+        start = time.perf_counter()
+        store = students_db.StudentDB(os.path.join(tmp, 'students.db'))
+        store.import_legacy_csv(csv_path)
+        imported = time.perf_counter() - start
+        print(f"{args.rows} students, one-time CSV import {imported:.2f}s")
+
+        root, listbox = open_listbox()
+        if listbox is None:
+            print("no display, timing without a Listbox")
+        print(f"{'mode':<10}{'first row ms':>14}{'all rows ms':>14}")
+        for mode, run in (('legacy', lambda: legacy(csv_path, listbox)), ('streamed', lambda: streamed(store, listbox))):
+            if listbox is not None:
+                listbox.delete(0, 'end')
+            first, total = run()
+            print(f"{mode:<10}{first * 1000:>14.1f}{total * 1000:>14.1f}")
+        store.close()
+        if root is not None:
+            root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# Theme toggle latency of ToDoApp with many task rows on screen. Needs a display.
+#
+#   python -m benchmarks.theme --rows 5000
+#
+# "app" is ToDoApp.toggle_theme on a list of --rows tasks (ttk theme switch,
+# the few classic widgets and the settings write). The other two put --rows
+# labels in a window and compare the old way, configure() on every widget,
+# with a single ttk theme switch over ttk labels. Each toggle is timed up to
+# update_idletasks(), i.e. including the redraw Tk queues for it.
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.todo import load_todo
+
+
+def timed_toggles(toggle, root, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        toggle()
+        root.update_idletasks()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[-1] * 1000
+
+
+def report(mode, rows, toggle, root, runs):
+    p50, worst = timed_toggles(toggle, root, runs)
+    print(f"{mode:<12}{rows:>8}{p50:>10.2f}{worst:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+    todo = load_todo()
+    try:
+        root = todo.tk.Tk()
+    except todo.tk.TclError:
+        print("no display, nothing to measure")
+        return
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            store = todo.TaskStore(fsync=False)
+            for i in range(args.rows):
+                store.add(f"task number {i}")
+            store.close()
+            app = todo.ToDoApp(root)
+            root.update()
+            print(f"{'mode':<12}{'rows':>8}{'p50 ms':>10}{'max ms':>10}")
+            report('app', len(app.model), app.toggle_theme, root, args.runs)
+
+            window = todo.tk.Toplevel(root)
+            frame = todo.tk.Frame(window)
+            frame.pack()
+            labels = [todo.tk.Label(frame, text=f"task number {i}") for i in range(args.rows)]
+            for i, label in enumerate(labels):
+                label.grid(row=i % 100, column=i // 100)
+            dark = [False]
+
+            def configure_each():
+                dark[0] = not dark[0]
+                palette = todo.THEMES['dark' if dark[0] else 'light']
+                for label in labels:
+                    label.configure(bg=palette['background'], fg=palette['foreground'])
+            root.update()
+            report('per-widget', args.rows, configure_each, root, args.runs)
+            window.destroy()
+
+            window = todo.tk.Toplevel(root)
+            frame = todo.ttk.Frame(window)
+            frame.pack()
+            for i in range(args.rows):
+                todo.ttk.Label(frame, text=f"task number {i}").grid(row=i % 100, column=i // 100)
+            root.update()
+            report('ttk switch', args.rows, lambda: app.themes.use(app.themes.next()), root, args.runs)
+            app.close()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Startup and filter latency of the ToDoApp task model on a large task list.
+#
+#   python -m benchmarks.todo --tasks 100000
+#
+# Builds a task journal of --tasks adds (a third marked done), then times
+# reopening it (snapshot + journal replay and indexing), and each keystroke
+# of typing a few search queries under every status filter and sort order.
+# "naive" is the old way of filtering: scanning every row's text.
+
+import argparse
+import importlib.util
+import os
+import random
+import tempfile
+import time
+
+WORDS = ("buy milk call mom write report fix bug review pull request plan trip book flight pay rent clean kitchen "
+         "water plants renew passport answer email update resume").split()
+QUERIES = ("review pull", "pay rent", "item123")
+
+
+def load_todo():
+    # TO-DO_list.py is not an importable module name
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'TO-DO_list.py')
+    spec = importlib.util.spec_from_file_location('todo_list', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def keystrokes(query):
+    return [query[:i] for i in range(1, len(query) + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    todo = load_todo()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tasks')
+        store = todo.TaskStore(path, legacy_file=None, fsync=False)
+        start = time.perf_counter()
+        for i in range(args.tasks):
+            task = store.add(" ".join(rng.choice(WORDS) for _ in range(4)) + f" item{i}")
+            if i % 3 == 0:
+                store.mark_done(task.id)
+        print(f"{args.tasks} tasks journaled in {time.perf_counter() - start:.2f}s")
+        store.close()
+
+        start = time.perf_counter()
+        store = todo.TaskStore(path, legacy_file=None, fsync=False)
+        replayed = time.perf_counter() - start
+        start = time.perf_counter()
+        model = todo.TaskModel(store)
+        indexed = time.perf_counter() - start
+        print(f"startup: replay {replayed * 1000:.1f} ms ({store.journal_ops} journal ops), "
+              f"index {indexed * 1000:.1f} ms")
+
+        print(f"{'filter':<10}{'sort':<10}{'p50 ms':>10}{'max ms':>10}")
+        for status in (None, False, True):
+            for sort in todo.TaskModel.SORTS:
+                samples = []
+                for query in QUERIES:
+                    for typed in keystrokes(query):
+                        begin = time.perf_counter()
+                        model.search(typed, status, sort)
+                        samples.append(time.perf_counter() - begin)
+                samples.sort()
+                label = {None: 'all', False: 'pending', True: 'done'}[status]
+                print(f"{label:<10}{sort:<10}{samples[len(samples) // 2] * 1000:>10.2f}{samples[-1] * 1000:>10.2f}")
+
+        rows = [todo.ToDoApp.format_task(None, task) for task in store]
+        samples = []
+        for query in QUERIES:
+            for typed in keystrokes(query):
+                begin = time.perf_counter()
+                [row for row in rows if typed in row.lower()]
+                samples.append(time.perf_counter() - begin)
+        samples.sort()
+        print(f"{'naive':<20}{samples[len(samples) // 2] * 1000:>10.2f}{samples[-1] * 1000:>10.2f}")
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
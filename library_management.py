@@ -1,354 +1,1900 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import sqlite3
-from datetime import datetime, timedelta
-
-DB_NAME = 'library.db'
-
-# --- DATABASE FUNCTIONS ---
-
-def connect_db():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS books (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            author TEXT NOT NULL,
-            isbn TEXT UNIQUE,
-            quantity INTEGER NOT NULL
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS borrowers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            contact TEXT
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS issued (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            book_id INTEGER,
-            borrower_id INTEGER,
-            issue_date TEXT,
-            due_date TEXT,
-            returned INTEGER DEFAULT 0,
-            FOREIGN KEY(book_id) REFERENCES books(id),
-            FOREIGN KEY(borrower_id) REFERENCES borrowers(id)
-        )
-    ''')
-    conn.commit()
-    return conn
-
-def add_book(title, author, isbn, quantity):
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO books (title, author, isbn, quantity) VALUES (?, ?, ?, ?)',
-                   (title, author, isbn, quantity))
-    conn.commit()
-    conn.close()
-
-def get_books():
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM books')
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-def add_borrower(name, contact):
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('INSERT INTO borrowers (name, contact) VALUES (?, ?)', (name, contact))
-    conn.commit()
-    conn.close()
-
-def get_borrowers():
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM borrowers')
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-def issue_book(book_id, borrower_id, issue_date, due_date):
-    conn = connect_db()
-    cursor = conn.cursor()
-    # Check book quantity
-    cursor.execute('SELECT quantity FROM books WHERE id=?', (book_id,))
-    quantity = cursor.fetchone()[0]
-    if quantity <= 0:
-        conn.close()
-        return False, "Book not available for issue"
-    # Insert into issued
-    cursor.execute('INSERT INTO issued (book_id, borrower_id, issue_date, due_date) VALUES (?, ?, ?, ?)',
-                   (book_id, borrower_id, issue_date, due_date))
-    # Reduce book quantity by 1
-    cursor.execute('UPDATE books SET quantity = quantity - 1 WHERE id=?', (book_id,))
-    conn.commit()
-    conn.close()
-    return True, "Book issued successfully"
-
-def get_issued_books():
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT issued.id, books.title, borrowers.name, issued.issue_date, issued.due_date, issued.returned
-        FROM issued
-        JOIN books ON issued.book_id = books.id
-        JOIN borrowers ON issued.borrower_id = borrowers.id
-    ''')
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
-
-def return_book(issue_id):
-    conn = connect_db()
-    cursor = conn.cursor()
-    # Mark issued record as returned
-    cursor.execute('UPDATE issued SET returned=1 WHERE id=?', (issue_id,))
-    # Get book id to increase quantity
-    cursor.execute('SELECT book_id FROM issued WHERE id=?', (issue_id,))
-    book_id = cursor.fetchone()[0]
-    cursor.execute('UPDATE books SET quantity = quantity + 1 WHERE id=?', (book_id,))
-    conn.commit()
-    conn.close()
-
-# --- GUI CLASSES ---
-
-class LibraryApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Library Book Management System")
-        self.geometry("900x600")
-
-        tabControl = ttk.Notebook(self)
-        self.book_tab = BookTab(tabControl)
-        self.borrower_tab = BorrowerTab(tabControl)
-        self.issue_tab = IssueTab(tabControl)
-
-        tabControl.add(self.book_tab, text="Books")
-        tabControl.add(self.borrower_tab, text="Borrowers")
-        tabControl.add(self.issue_tab, text="Issue/Return")
-        tabControl.pack(expand=1, fill="both")
-
-class BookTab(tk.Frame):
-    def __init__(self, parent):
-        super().__init__(parent)
-        # Form
-        form = tk.Frame(self)
-        form.pack(pady=10)
-
-        tk.Label(form, text="Title:").grid(row=0, column=0, padx=5, pady=5)
-        tk.Label(form, text="Author:").grid(row=1, column=0, padx=5, pady=5)
-        tk.Label(form, text="ISBN:").grid(row=2, column=0, padx=5, pady=5)
-        tk.Label(form, text="Quantity:").grid(row=3, column=0, padx=5, pady=5)
-
-        self.title_var = tk.StringVar()
-        self.author_var = tk.StringVar()
-        self.isbn_var = tk.StringVar()
-        self.quantity_var = tk.IntVar()
-
-        tk.Entry(form, textvariable=self.title_var).grid(row=0, column=1)
-        tk.Entry(form, textvariable=self.author_var).grid(row=1, column=1)
-        tk.Entry(form, textvariable=self.isbn_var).grid(row=2, column=1)
-        tk.Entry(form, textvariable=self.quantity_var).grid(row=3, column=1)
-
-        tk.Button(form, text="Add Book", command=self.add_book).grid(row=4, column=0, columnspan=2, pady=10)
-
-        # Treeview for books
-        self.tree = ttk.Treeview(self, columns=("ID", "Title", "Author", "ISBN", "Quantity"), show="headings")
-        self.tree.heading("ID", text="ID")
-        self.tree.heading("Title", text="Title")
-        self.tree.heading("Author", text="Author")
-        self.tree.heading("ISBN", text="ISBN")
-        self.tree.heading("Quantity", text="Quantity")
-        self.tree.pack(expand=True, fill="both", pady=10)
-
-        self.load_books()
-
-    def add_book(self):
-        title = self.title_var.get()
-        author = self.author_var.get()
-        isbn = self.isbn_var.get()
-        quantity = self.quantity_var.get()
-
-        if not title or not author or not isbn or quantity <= 0:
-            messagebox.showerror("Error", "Please fill all fields with valid data.")
-            return
-
-        try:
-            add_book(title, author, isbn, quantity)
-            messagebox.showinfo("Success", "Book added successfully.")
-            self.clear_fields()
-            self.load_books()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add book: {e}")
-
-    def load_books(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for row in get_books():
-            self.tree.insert("", "end", values=row)
-
-    def clear_fields(self):
-        self.title_var.set("")
-        self.author_var.set("")
-        self.isbn_var.set("")
-        self.quantity_var.set(0)
-
-class BorrowerTab(tk.Frame):
-    def __init__(self, parent):
-        super().__init__(parent)
-        form = tk.Frame(self)
-        form.pack(pady=10)
-
-        tk.Label(form, text="Name:").grid(row=0, column=0, padx=5, pady=5)
-        tk.Label(form, text="Contact:").grid(row=1, column=0, padx=5, pady=5)
-
-        self.name_var = tk.StringVar()
-        self.contact_var = tk.StringVar()
-
-        tk.Entry(form, textvariable=self.name_var).grid(row=0, column=1)
-        tk.Entry(form, textvariable=self.contact_var).grid(row=1, column=1)
-
-        tk.Button(form, text="Add Borrower", command=self.add_borrower).grid(row=2, column=0, columnspan=2, pady=10)
-
-        self.tree = ttk.Treeview(self, columns=("ID", "Name", "Contact"), show="headings")
-        self.tree.heading("ID", text="ID")
-        self.tree.heading("Name", text="Name")
-        self.tree.heading("Contact", text="Contact")
-        self.tree.pack(expand=True, fill="both", pady=10)
-
-        self.load_borrowers()
-
-    def add_borrower(self):
-        name = self.name_var.get()
-        contact = self.contact_var.get()
-
-        if not name:
-            messagebox.showerror("Error", "Name is required.")
-            return
-
-        try:
-            add_borrower(name, contact)
-            messagebox.showinfo("Success", "Borrower added successfully.")
-            self.clear_fields()
-            self.load_borrowers()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add borrower: {e}")
-
-    def load_borrowers(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for row in get_borrowers():
-            self.tree.insert("", "end", values=row)
-
-    def clear_fields(self):
-        self.name_var.set("")
-        self.contact_var.set("")
-
-class IssueTab(tk.Frame):
-    def __init__(self, parent):
-        super().__init__(parent)
-
-        # Issue book frame
-        issue_frame = tk.LabelFrame(self, text="Issue Book")
-        issue_frame.pack(fill="x", padx=10, pady=10)
-
-        tk.Label(issue_frame, text="Select Book:").grid(row=0, column=0, padx=5, pady=5)
-        tk.Label(issue_frame, text="Select Borrower:").grid(row=1, column=0, padx=5, pady=5)
-        tk.Label(issue_frame, text="Due Days (from today):").grid(row=2, column=0, padx=5, pady=5)
-
-        self.book_var = tk.StringVar()
-        self.borrower_var = tk.StringVar()
-        self.due_days_var = tk.IntVar(value=7)
-
-        self.book_combo = ttk.Combobox(issue_frame, textvariable=self.book_var, state="readonly", width=50)
-        self.borrower_combo = ttk.Combobox(issue_frame, textvariable=self.borrower_var, state="readonly", width=50)
-        self.book_combo.grid(row=0, column=1, padx=5, pady=5)
-        self.borrower_combo.grid(row=1, column=1, padx=5, pady=5)
-        tk.Entry(issue_frame, textvariable=self.due_days_var, width=5).grid(row=2, column=1, padx=5, pady=5, sticky="w")
-
-        tk.Button(issue_frame, text="Issue Book", command=self.issue_book).grid(row=3, column=0, columnspan=2, pady=10)
-
-        # Issued books treeview
-        issued_frame = tk.LabelFrame(self, text="Issued Books")
-        issued_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        self.tree = ttk.Treeview(issued_frame, columns=("ID", "Book Title", "Borrower", "Issue Date", "Due Date", "Returned"), show="headings")
-        for col in ("ID", "Book Title", "Borrower", "Issue Date", "Due Date", "Returned"):
-            self.tree.heading(col, text=col)
-        self.tree.pack(fill="both", expand=True, side="left")
-
-        scrollbar = ttk.Scrollbar(issued_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
-
-        # Return book button
-        tk.Button(self, text="Return Selected Book", command=self.return_book).pack(pady=10)
-
-        self.load_books_and_borrowers()
-        self.load_issued_books()
-
-    def load_books_and_borrowers(self):
-        books = get_books()
-        book_list = [f"{b[0]}: {b[1]} (Qty: {b[4]})" for b in books]
-        self.book_combo['values'] = book_list
-
-        borrowers = get_borrowers()
-        borrower_list = [f"{b[0]}: {b[1]}" for b in borrowers]
-        self.borrower_combo['values'] = borrower_list
-
-    def issue_book(self):
-        if not self.book_var.get() or not self.borrower_var.get():
-            messagebox.showerror("Error", "Please select a book and borrower.")
-            return
-
-        try:
-            book_id = int(self.book_var.get().split(":")[0])
-            borrower_id = int(self.borrower_var.get().split(":")[0])
-            issue_date = datetime.now().strftime("%Y-%m-%d")
-            due_days = self.due_days_var.get()
-            if due_days <= 0:
-                messagebox.showerror("Error", "Due days must be positive.")
-                return
-            due_date = (datetime.now() + timedelta(days=due_days)).strftime("%Y-%m-%d")
-
-            success, msg = issue_book(book_id, borrower_id, issue_date, due_date)
-            if success:
-                messagebox.showinfo("Success", msg)
-                self.load_books_and_borrowers()
-                self.load_issued_books()
-            else:
-                messagebox.showerror("Error", msg)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to issue book: {e}")
-
-    def load_issued_books(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for row in get_issued_books():
-            returned_str = "Yes" if row[5] else "No"
-            self.tree.insert("", "end", values=(row[0], row[1], row[2], row[3], row[4], returned_str))
-
-    def return_book(self):
-        selected = self.tree.selection()
-        if not selected:
-            messagebox.showerror("Error", "Please select an issued book to return.")
-            return
-        issue_id = self.tree.item(selected[0])['values'][0]
-        # Check if already returned
-        if self.tree.item(selected[0])['values'][5] == "Yes":
-            messagebox.showinfo("Info", "This book is already returned.")
-            return
-        return_book(issue_id)
-        messagebox.showinfo("Success", "Book returned successfully.")
-        self.load_books_and_borrowers()
-        self.load_issued_books()
-
-# --- RUN APP ---
-if __name__ == "__main__":
-    app = LibraryApp()
-    app.mainloop()
+import tkinter as tk
+from tkinter import ttk, messagebox
+import sqlite3
+import argparse
+import atexit
+import csv
+import json
+import logging
+import random
+import re
+import sys
+import time
+import queue
+import threading
+from collections import OrderedDict, deque, namedtuple
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from datetime import datetime, timedelta
+
+DB_NAME = 'library.db'
+
+# Connection pool settings. The pragmas are applied to every pooled connection;
+# WAL lets the desks keep reading while another one writes.
+POOL_SIZE = 4
+CACHE_SIZE = 256
+SLOW_QUERY_MS = 50
+METRICS_FILE = 'library_metrics.json'
+BUSY_RETRIES = 5
+BUSY_BACKOFF = 0.05
+# Returned loans older than this move from issued to issued_archive
+ARCHIVE_AFTER_DAYS = 180
+DB_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -16000,
+    'busy_timeout': 5000,
+}
+
+SCHEMA = [
+    '''
+        CREATE TABLE IF NOT EXISTS books (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            isbn TEXT UNIQUE,
+            quantity INTEGER NOT NULL
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS borrowers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            contact TEXT
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS issued (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER,
+            borrower_id INTEGER,
+            issue_date TEXT,
+            due_date TEXT,
+            returned INTEGER DEFAULT 0,
+            FOREIGN KEY(book_id) REFERENCES books(id),
+            FOREIGN KEY(borrower_id) REFERENCES borrowers(id)
+        )
+    ''',
+]
+
+# Schema versions, tracked in PRAGMA user_version. Append new steps at the end;
+# a step is an SQL statement or a function taking the connection.
+MIGRATIONS = [
+    (1, SCHEMA),
+    (2, [
+        # Covers the open-loan and overdue lookups without touching the table
+        'CREATE INDEX IF NOT EXISTS idx_issued_open ON issued(returned, due_date, book_id, borrower_id, issue_date)',
+        'CREATE INDEX IF NOT EXISTS idx_issued_book ON issued(book_id, returned)',
+        'CREATE INDEX IF NOT EXISTS idx_issued_borrower ON issued(borrower_id, returned, due_date)',
+    ]),
+    (3, [
+        # Publication year from the catalog CSV files
+        'ALTER TABLE books ADD COLUMN year INTEGER',
+    ]),
+    (4, [
+        # Full-text search, external content tables kept in sync by triggers
+        "CREATE VIRTUAL TABLE books_fts USING fts5(title, author, isbn, content='books', content_rowid='id', prefix='2 3')",
+        '''
+            CREATE TRIGGER books_fts_insert AFTER INSERT ON books BEGIN
+                INSERT INTO books_fts(rowid, title, author, isbn) VALUES (new.id, new.title, new.author, new.isbn);
+            END
+        ''',
+        '''
+            CREATE TRIGGER books_fts_delete AFTER DELETE ON books BEGIN
+                INSERT INTO books_fts(books_fts, rowid, title, author, isbn)
+                VALUES ('delete', old.id, old.title, old.author, old.isbn);
+            END
+        ''',
+        '''
+            CREATE TRIGGER books_fts_update AFTER UPDATE OF title, author, isbn ON books BEGIN
+                INSERT INTO books_fts(books_fts, rowid, title, author, isbn)
+                VALUES ('delete', old.id, old.title, old.author, old.isbn);
+                INSERT INTO books_fts(rowid, title, author, isbn) VALUES (new.id, new.title, new.author, new.isbn);
+            END
+        ''',
+        "INSERT INTO books_fts(books_fts) VALUES ('rebuild')",
+        "CREATE VIRTUAL TABLE borrowers_fts USING fts5(name, contact, content='borrowers', content_rowid='id', prefix='2 3')",
+        '''
+            CREATE TRIGGER borrowers_fts_insert AFTER INSERT ON borrowers BEGIN
+                INSERT INTO borrowers_fts(rowid, name, contact) VALUES (new.id, new.name, new.contact);
+            END
+        ''',
+        '''
+            CREATE TRIGGER borrowers_fts_delete AFTER DELETE ON borrowers BEGIN
+                INSERT INTO borrowers_fts(borrowers_fts, rowid, name, contact)
+                VALUES ('delete', old.id, old.name, old.contact);
+            END
+        ''',
+        '''
+            CREATE TRIGGER borrowers_fts_update AFTER UPDATE OF name, contact ON borrowers BEGIN
+                INSERT INTO borrowers_fts(borrowers_fts, rowid, name, contact)
+                VALUES ('delete', old.id, old.name, old.contact);
+                INSERT INTO borrowers_fts(rowid, name, contact) VALUES (new.id, new.name, new.contact);
+            END
+        ''',
+        "INSERT INTO borrowers_fts(borrowers_fts) VALUES ('rebuild')",
+    ]),
+    (5, [
+        # Case-insensitive prefix lookups for the type-ahead selectors
+        'CREATE INDEX idx_books_title ON books(title COLLATE NOCASE)',
+        'CREATE INDEX idx_borrowers_name ON borrowers(name COLLATE NOCASE)',
+    ]),
+    (6, [
+        # Summary tables for the reports, kept up to date by issue_book/return_book
+        'ALTER TABLE issued ADD COLUMN returned_date TEXT',
+        '''
+            CREATE TABLE book_stats (
+                book_id INTEGER PRIMARY KEY,
+                times_borrowed INTEGER NOT NULL DEFAULT 0,
+                active_loans INTEGER NOT NULL DEFAULT 0
+            )
+        ''',
+        'CREATE INDEX idx_book_stats_borrowed ON book_stats(times_borrowed)',
+        '''
+            CREATE TABLE borrower_stats (
+                borrower_id INTEGER PRIMARY KEY,
+                total_loans INTEGER NOT NULL DEFAULT 0,
+                active_loans INTEGER NOT NULL DEFAULT 0
+            )
+        ''',
+        'CREATE INDEX idx_borrower_stats_active ON borrower_stats(active_loans)',
+        '''
+            CREATE TABLE daily_circulation (
+                day TEXT PRIMARY KEY,
+                issued INTEGER NOT NULL DEFAULT 0,
+                returned INTEGER NOT NULL DEFAULT 0
+            )
+        ''',
+        lambda conn: rebuild_stats(conn),
+    ]),
+    (7, [
+        # Returned loans are archived so issued only holds open and recent loans.
+        # Ids are kept, AUTOINCREMENT on issued never hands them out again.
+        '''
+            CREATE TABLE issued_archive (
+                id INTEGER PRIMARY KEY,
+                book_id INTEGER,
+                borrower_id INTEGER,
+                issue_date TEXT,
+                due_date TEXT,
+                returned INTEGER DEFAULT 1,
+                returned_date TEXT
+            )
+        ''',
+        'CREATE INDEX idx_issued_archive_book ON issued_archive(book_id)',
+        'CREATE INDEX idx_issued_archive_borrower ON issued_archive(borrower_id)',
+        # Old rows without a returned_date are aged by their due date
+        'CREATE INDEX idx_issued_archivable ON issued(COALESCE(returned_date, due_date)) WHERE returned = 1',
+        '''
+            CREATE VIEW loan_history AS
+            SELECT id, book_id, borrower_id, issue_date, due_date, returned, returned_date FROM issued
+            UNION ALL
+            SELECT id, book_id, borrower_id, issue_date, due_date, returned, returned_date FROM issued_archive
+        ''',
+    ]),
+]
+
+ISSUED_SELECT = '''
+    SELECT issued.id, books.title, borrowers.name, issued.issue_date, issued.due_date, issued.returned
+    FROM issued
+    JOIN books ON issued.book_id = books.id
+    JOIN borrowers ON issued.borrower_id = borrowers.id
+'''
+
+HISTORY_SELECT = '''
+    SELECT loan_history.id, books.title, borrowers.name, loan_history.issue_date, loan_history.due_date,
+           loan_history.returned, loan_history.returned_date
+    FROM loan_history
+    LEFT JOIN books ON loan_history.book_id = books.id
+    LEFT JOIN borrowers ON loan_history.borrower_id = borrowers.id
+'''
+
+def _page_sql(select, table):
+    # Keyset page: the rows after a known id
+    return f'{select} WHERE {table}.id > ? ORDER BY {table}.id LIMIT ?'
+
+def _page_jump_sql(select, table):
+    # Page at an offset, for scrollbar jumps. The offset is found on the bare
+    # primary key first, so the joins only run for the rows of the page.
+    return (f'{select} WHERE {table}.id >= (SELECT id FROM {table} ORDER BY id LIMIT 1 OFFSET ?) '
+            f'ORDER BY {table}.id LIMIT ?')
+
+# Queries on the circulation hot path with sample parameters. check_query_plans()
+# fails if any of them would scan a whole table without an index.
+HOT_QUERIES = {
+    'take_copy': ('UPDATE books SET quantity = quantity - 1 WHERE id=? AND quantity > 0', (1,)),
+    'mark_returned': ('UPDATE issued SET returned=1, returned_date=? WHERE id=? AND returned=0', ('2024-01-01', 1)),
+    'return_lookup': ('SELECT book_id, borrower_id FROM issued WHERE id=?', (1,)),
+    'open_loans': (ISSUED_SELECT + 'WHERE issued.returned = 0 ORDER BY issued.due_date', ()),
+    'borrower_loans': (ISSUED_SELECT + 'WHERE issued.borrower_id = ? AND issued.returned = 0 ORDER BY issued.due_date',
+                       (1,)),
+    'book_loans': ('SELECT id, borrower_id, due_date FROM issued WHERE book_id = ? AND returned = 0', (1,)),
+    'overdue_loans': (ISSUED_SELECT + 'WHERE issued.returned = 0 AND issued.due_date < ? ORDER BY issued.due_date LIMIT ?',
+                      ('2024-01-01', 100)),
+    'top_borrowed': ('''
+        SELECT books.id, books.title, books.author, book_stats.times_borrowed, book_stats.active_loans
+        FROM book_stats JOIN books ON books.id = book_stats.book_id
+        ORDER BY book_stats.times_borrowed DESC LIMIT ?
+    ''', (10,)),
+    'borrower_load': ('''
+        SELECT borrowers.id, borrowers.name, borrower_stats.active_loans, borrower_stats.total_loans
+        FROM borrower_stats JOIN borrowers ON borrowers.id = borrower_stats.borrower_id
+        ORDER BY borrower_stats.active_loans DESC LIMIT ?
+    ''', (10,)),
+    'archivable': ('SELECT id FROM issued WHERE returned = 1 AND COALESCE(returned_date, due_date) < ? LIMIT ?',
+                   ('2024-01-01', 5000)),
+    'borrower_history': (HISTORY_SELECT + 'WHERE loan_history.borrower_id = ? ORDER BY loan_history.id DESC LIMIT ?',
+                         (1, 100)),
+    'book_prefix': ("SELECT * FROM books WHERE title LIKE ? ESCAPE '\\' ORDER BY title COLLATE NOCASE LIMIT ?",
+                    ('py%', 20)),
+    'borrower_prefix': ("SELECT * FROM borrowers WHERE name LIKE ? ESCAPE '\\' ORDER BY name COLLATE NOCASE LIMIT ?",
+                        ('al%', 20)),
+    'books_page': (_page_sql('SELECT * FROM books', 'books'), (0, 200)),
+    'books_page_jump': (_page_jump_sql('SELECT * FROM books', 'books'), (1000, 200)),
+    'borrowers_page': (_page_sql('SELECT * FROM borrowers', 'borrowers'), (0, 200)),
+    'borrowers_page_jump': (_page_jump_sql('SELECT * FROM borrowers', 'borrowers'), (1000, 200)),
+    'issued_page': (_page_sql(ISSUED_SELECT, 'issued'), (0, 200)),
+    'issued_page_jump': (_page_jump_sql(ISSUED_SELECT, 'issued'), (1000, 200)),
+}
+
+# Scans check_query_plans() accepts, once each: an offset jump walks the
+# primary key up to the offset by design, reading nothing but ids
+EXPECTED_SCANS = {
+    'books_page_jump': ['SCAN books'],
+    'borrowers_page_jump': ['SCAN borrowers'],
+    'issued_page_jump': ['SCAN issued'],
+}
+
+# --- METRICS ---
+
+# Silent unless the application configures logging (the CLI's --log-slow-queries);
+# without a handler every slow statement would go to stderr
+logging.getLogger('library').addHandler(logging.NullHandler())
+slow_query_log = logging.getLogger('library.slow_query')
+
+class Metrics:
+    # Call counts and latency histograms per name, plus the most recent slow
+    # statements. Names: data functions by function name, 'sql.*' for statements,
+    # 'ui.*' for widget refreshes, 'db.connect' for opening connections.
+    BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, slow_log_size=200):
+        self.lock = threading.Lock()
+        self.timings = {}
+        self.slow_queries = deque(maxlen=slow_log_size)
+
+    def record(self, name, ms):
+        with self.lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                timing = self.timings[name] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                               'buckets': [0] * (len(self.BUCKETS_MS) + 1)}
+            timing['count'] += 1
+            timing['total_ms'] += ms
+            timing['max_ms'] = max(timing['max_ms'], ms)
+            timing['buckets'][bisect_left(self.BUCKETS_MS, ms)] += 1
+
+    def record_query(self, name, sql, params, ms):
+        self.record(name, ms)
+        if ms >= SLOW_QUERY_MS:
+            sql = ' '.join(sql.split())
+            with self.lock:
+                self.slow_queries.append({'time': datetime.now().isoformat(timespec='seconds'),
+                                          'ms': round(ms, 3), 'sql': sql, 'params': repr(params)})
+            slow_query_log.warning("%.1f ms: %s %r", ms, sql, params)
+
+    def snapshot(self):
+        with self.lock:
+            timings = {}
+            for name, timing in sorted(self.timings.items()):
+                buckets = {f"<={bound}ms": n for bound, n in zip(self.BUCKETS_MS, timing['buckets'])}
+                buckets[f">{self.BUCKETS_MS[-1]}ms"] = timing['buckets'][-1]
+                timings[name] = {'count': timing['count'], 'total_ms': round(timing['total_ms'], 3),
+                                 'mean_ms': round(timing['total_ms'] / timing['count'], 3),
+                                 'max_ms': round(timing['max_ms'], 3), 'histogram': buckets}
+            return {'timings': timings, 'slow_queries': list(self.slow_queries), 'cache': cache_stats()}
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.snapshot(), file, indent=2)
+        return path
+
+    def reset(self):
+        with self.lock:
+            self.timings.clear()
+            self.slow_queries.clear()
+
+metrics = Metrics()
+
+@contextmanager
+def timed_block(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, (time.perf_counter() - start) * 1000)
+
+def timed(name=None):
+    # @timed() records under the function name, @timed('ui.render') under a fixed one
+    def decorator(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed_block(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def dump_metrics_at_exit(path):
+    atexit.register(metrics.dump, path)
+
+class InstrumentedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            metrics.record_query('sql.execute', sql, parameters, (time.perf_counter() - start) * 1000)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.record_query('sql.executemany', sql, f"<{self.rowcount} rows>",
+                                 (time.perf_counter() - start) * 1000)
+
+    def fetchone(self):
+        with timed_block('sql.fetch'):
+            return super().fetchone()
+
+    def fetchmany(self, size=None):
+        with timed_block('sql.fetch'):
+            return super().fetchmany(self.arraysize if size is None else size)
+
+    def fetchall(self):
+        with timed_block('sql.fetch'):
+            return super().fetchall()
+
+class InstrumentedConnection(sqlite3.Connection):
+    # Connection.execute() does not go through cursor(), so route both here
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+# --- CONNECTION POOL ---
+
+class ConnectionPool:
+    def __init__(self, db_name, size=POOL_SIZE, pragmas=None):
+        self.db_name = db_name
+        self.size = size
+        self.pragmas = dict(DB_PRAGMAS if pragmas is None else pragmas)
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._schema_ready = False
+        self._closed = False
+
+    def open_connection(self):
+        # Autocommit mode, writes use transaction() so BEGIN/COMMIT are explicit
+        with timed_block('db.connect'):
+            conn = sqlite3.connect(self.db_name, isolation_level=None, check_same_thread=False,
+                                   factory=InstrumentedConnection)
+            for name, value in self.pragmas.items():
+                conn.execute(f'PRAGMA {name}={value}')
+        with self._lock:
+            if not self._schema_ready:
+                migrate(conn)
+                self._schema_ready = True
+        return conn
+
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._created < self.size
+            if can_open:
+                self._created += 1
+        if not can_open:
+            # Pool exhausted, wait for another caller to give one back
+            return self._idle.get()
+        try:
+            return self.open_connection()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def release(self, conn):
+        if self._closed:
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(DB_NAME, POOL_SIZE, DB_PRAGMAS)
+        return _pool
+
+def configure_db(db_name=None, pool_size=None, pragmas=None):
+    # Switch database file or connection settings; the next call opens a fresh pool
+    global DB_NAME, POOL_SIZE, DB_PRAGMAS
+    if db_name is not None:
+        DB_NAME = db_name
+    if pool_size is not None:
+        POOL_SIZE = pool_size
+    if pragmas is not None:
+        DB_PRAGMAS = dict(pragmas)
+    close_db()
+
+def close_db():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+    _cache.reset()
+
+atexit.register(close_db)
+
+@contextmanager
+def transaction(conn):
+    # BEGIN IMMEDIATE takes the write lock up front instead of upgrading later
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+def _is_busy(error):
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return 'locked' in str(error) or 'busy' in str(error)
+
+def retry_busy(fn):
+    # Retry a whole write when another process holds the lock past busy_timeout
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                return fn(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if attempt == BUSY_RETRIES or not _is_busy(e):
+                    raise
+                time.sleep(BUSY_BACKOFF * (2 ** attempt) * (0.5 + random.random()))
+    return wrapper
+
+# --- READ CACHE ---
+
+class ReadCache:
+    # LRU of catalog/borrower query results. Every entry remembers the
+    # PRAGMA data_version it was read at. That value, read on a private
+    # connection, changes whenever any other connection commits (this process
+    # or another), so any write invalidates the cache and reads never do.
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._watch = None
+
+    def data_version(self):
+        if self._watch is None:
+            self._watch = sqlite3.connect(DB_NAME, check_same_thread=False)
+        return self._watch.execute('PRAGMA data_version').fetchone()[0]
+
+    def call(self, fn, args, kwargs):
+        key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+        with self.lock:
+            version = self.data_version()
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry[1])
+            self.misses += 1
+        # Tagged with the version from before the query, a write that lands in
+        # between just makes the entry stale straight away
+        result = fn(*args, **kwargs)
+        with self.lock:
+            self.entries[key] = (version, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return _copy(result)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries),
+                    'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def reset(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+            if self._watch is not None:
+                self._watch.close()
+                self._watch = None
+
+def _copy(result):
+    # Callers may patch the lists they get back (PagedSource does), keep ours intact
+    return list(result) if isinstance(result, list) else result
+
+_cache = ReadCache()
+
+def cached(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return _cache.call(fn, args, kwargs)
+    return wrapper
+
+def cache_stats():
+    return _cache.stats()
+
+# --- CHANGE NOTIFICATIONS ---
+
+# One row-level delta. op is 'insert' or 'update'; row has the same shape as the
+# matching page query (books/borrowers: SELECT *, issued: ISSUED_SELECT).
+# Bulk writes send a single 'reload' change with row=None instead.
+Change = namedtuple('Change', 'table op row')
+
+_listeners = []
+
+def subscribe(callback):
+    # callback(changes) is called with a list of Change after every committed write
+    _listeners.append(callback)
+    return callback
+
+def unsubscribe(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+def _notify(changes):
+    for callback in list(_listeners):
+        callback(changes)
+
+def _book_row(conn, book_id):
+    return conn.execute('SELECT * FROM books WHERE id=?', (book_id,)).fetchone()
+
+def _issued_row(conn, issue_id):
+    return conn.execute(ISSUED_SELECT + 'WHERE issued.id = ?', (issue_id,)).fetchone()
+
+# --- DATABASE FUNCTIONS ---
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn):
+    # Bring the database up to the latest schema version, each run is all-or-nothing
+    with transaction(conn):
+        current = schema_version(conn)
+        for version, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f'PRAGMA user_version = {version}')
+    return schema_version(conn)
+
+def check_query_plans(conn=None):
+    # Returns {query name: [plan lines]} for every hot query that does a full scan
+    if conn is None:
+        with get_pool().connection() as conn:
+            return check_query_plans(conn)
+    problems = {}
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+        expected = list(EXPECTED_SCANS.get(name, ()))
+        scans = []
+        for line in plan:
+            if line.startswith('SCAN ') and 'INDEX' not in line:
+                if line in expected:
+                    expected.remove(line)
+                else:
+                    scans.append(line)
+        if scans:
+            problems[name] = scans
+    return problems
+
+def connect_db():
+    # Standalone connection with the pool settings, for scripts and one-off use
+    return get_pool().open_connection()
+
+@timed()
+@retry_busy
+def add_book(title, author, isbn, quantity, year=None):
+    with get_pool().connection() as conn:
+        with transaction(conn):
+            cursor = conn.execute('INSERT INTO books (title, author, isbn, quantity, year) VALUES (?, ?, ?, ?, ?)',
+                                  (title, author, isbn, quantity, year))
+        row = _book_row(conn, cursor.lastrowid)
+    _notify([Change('books', 'insert', row)])
+
+@timed()
+@cached
+def get_books():
+    with get_pool().connection() as conn:
+        return conn.execute('SELECT * FROM books').fetchall()
+
+@timed()
+@retry_busy
+def add_borrower(name, contact):
+    with get_pool().connection() as conn, transaction(conn):
+        cursor = conn.execute('INSERT INTO borrowers (name, contact) VALUES (?, ?)', (name, contact))
+    _notify([Change('borrowers', 'insert', (cursor.lastrowid, name, contact))])
+
+@timed()
+@cached
+def get_borrowers():
+    with get_pool().connection() as conn:
+        return conn.execute('SELECT * FROM borrowers').fetchall()
+
+@timed()
+@retry_busy
+def issue_book(book_id, borrower_id, issue_date, due_date):
+    with get_pool().connection() as conn:
+        with transaction(conn):
+            # Take a copy only if one is left, check and decrement in one statement
+            if conn.execute(HOT_QUERIES['take_copy'][0], (book_id,)).rowcount == 0:
+                return False, "Book not available for issue"
+            cursor = conn.execute('INSERT INTO issued (book_id, borrower_id, issue_date, due_date) VALUES (?, ?, ?, ?)',
+                                  (book_id, borrower_id, issue_date, due_date))
+            _count_issue(conn, book_id, borrower_id, issue_date)
+        changes = [Change('books', 'update', _book_row(conn, book_id)),
+                   Change('issued', 'insert', _issued_row(conn, cursor.lastrowid))]
+    _notify(changes)
+    return True, "Book issued successfully"
+
+@timed()
+def get_issued_books():
+    with get_pool().connection() as conn:
+        return conn.execute(ISSUED_SELECT).fetchall()
+
+@timed()
+def get_open_loans():
+    sql, _ = HOT_QUERIES['open_loans']
+    with get_pool().connection() as conn:
+        return conn.execute(sql).fetchall()
+
+@timed()
+def get_borrower_loans(borrower_id):
+    sql, _ = HOT_QUERIES['borrower_loans']
+    with get_pool().connection() as conn:
+        return conn.execute(sql, (borrower_id,)).fetchall()
+
+def _match_query(text):
+    # Every word must match, the last one as a prefix so results follow typing
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words[:-1]) + f' "{words[-1]}"*'
+
+def _search(sql, text, limit):
+    query = _match_query(text)
+    if query is None:
+        return []
+    with get_pool().connection() as conn:
+        return conn.execute(sql, (query, limit)).fetchall()
+
+@timed()
+@cached
+def search_books(text, limit=200):
+    return _search('''
+        SELECT books.* FROM books_fts JOIN books ON books.id = books_fts.rowid
+        WHERE books_fts MATCH ? ORDER BY books_fts.rank LIMIT ?
+    ''', text, limit)
+
+@timed()
+@cached
+def search_borrowers(text, limit=200):
+    return _search('''
+        SELECT borrowers.* FROM borrowers_fts JOIN borrowers ON borrowers.id = borrowers_fts.rowid
+        WHERE borrowers_fts MATCH ? ORDER BY borrowers_fts.rank LIMIT ?
+    ''', text, limit)
+
+def _find(table, prefix_query, prefix, limit):
+    # Top matches for a type-ahead box: the row with that id, then titles/names starting with it
+    prefix = prefix.strip()
+    pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    sql, _ = HOT_QUERIES[prefix_query]
+    with get_pool().connection() as conn:
+        rows = []
+        if prefix.isdigit():
+            rows = conn.execute(f'SELECT * FROM {table} WHERE id=?', (int(prefix),)).fetchall()
+        seen = {row[0] for row in rows}
+        rows += [row for row in conn.execute(sql, (pattern, limit)) if row[0] not in seen]
+        return rows[:limit]
+
+@timed()
+@cached
+def find_books(prefix, limit=20):
+    return _find('books', 'book_prefix', prefix, limit)
+
+@timed()
+@cached
+def find_borrowers(prefix, limit=20):
+    return _find('borrowers', 'borrower_prefix', prefix, limit)
+
+# Paging: keyset (after_id) when continuing from a known row, OFFSET for jumps
+def _fetch_page(table, limit, offset=0, after_id=None):
+    with get_pool().connection() as conn:
+        if after_id is not None:
+            return conn.execute(HOT_QUERIES[f'{table}_page'][0], (after_id, limit)).fetchall()
+        return conn.execute(HOT_QUERIES[f'{table}_page_jump'][0], (offset, limit)).fetchall()
+
+def _count(table):
+    with get_pool().connection() as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+@timed()
+@cached
+def get_books_page(limit, offset=0, after_id=None):
+    return _fetch_page('books', limit, offset, after_id)
+
+@timed()
+@cached
+def count_books():
+    return _count('books')
+
+@timed()
+@cached
+def get_borrowers_page(limit, offset=0, after_id=None):
+    return _fetch_page('borrowers', limit, offset, after_id)
+
+@timed()
+@cached
+def count_borrowers():
+    return _count('borrowers')
+
+@timed()
+def get_issued_page(limit, offset=0, after_id=None):
+    return _fetch_page('issued', limit, offset, after_id)
+
+@timed()
+def count_issued():
+    return _count('issued')
+
+@timed()
+@retry_busy
+def return_book(issue_id, returned_date=None):
+    returned_date = returned_date or datetime.now().strftime("%Y-%m-%d")
+    with get_pool().connection() as conn:
+        with transaction(conn):
+            # Mark issued record as returned, unless another desk already did
+            if conn.execute(HOT_QUERIES['mark_returned'][0], (returned_date, issue_id)).rowcount == 0:
+                return False, "This book is already returned."
+            # Get book id to increase quantity
+            book_id, borrower_id = conn.execute(HOT_QUERIES['return_lookup'][0], (issue_id,)).fetchone()
+            conn.execute('UPDATE books SET quantity = quantity + 1 WHERE id=?', (book_id,))
+            _count_return(conn, book_id, borrower_id, returned_date)
+        changes = [Change('books', 'update', _book_row(conn, book_id)),
+                   Change('issued', 'update', _issued_row(conn, issue_id))]
+    _notify(changes)
+    return True, "Book returned successfully."
+
+# --- REPORTS ---
+
+# The summary tables are updated in the same transaction as the loan itself
+def _count_issue(conn, book_id, borrower_id, day):
+    conn.execute('''
+        INSERT INTO book_stats (book_id, times_borrowed, active_loans) VALUES (?, 1, 1)
+        ON CONFLICT(book_id) DO UPDATE SET times_borrowed = times_borrowed + 1, active_loans = active_loans + 1
+    ''', (book_id,))
+    conn.execute('''
+        INSERT INTO borrower_stats (borrower_id, total_loans, active_loans) VALUES (?, 1, 1)
+        ON CONFLICT(borrower_id) DO UPDATE SET total_loans = total_loans + 1, active_loans = active_loans + 1
+    ''', (borrower_id,))
+    conn.execute('''
+        INSERT INTO daily_circulation (day, issued) VALUES (?, 1)
+        ON CONFLICT(day) DO UPDATE SET issued = issued + 1
+    ''', (day,))
+
+def _count_return(conn, book_id, borrower_id, day):
+    conn.execute('UPDATE book_stats SET active_loans = active_loans - 1 WHERE book_id=?', (book_id,))
+    conn.execute('UPDATE borrower_stats SET active_loans = active_loans - 1 WHERE borrower_id=?', (borrower_id,))
+    conn.execute('''
+        INSERT INTO daily_circulation (day, returned) VALUES (?, 1)
+        ON CONFLICT(day) DO UPDATE SET returned = returned + 1
+    ''', (day,))
+
+def rebuild_stats(conn):
+    # Recompute the summary tables from every loan, for the migration and bulk loads
+    loans = 'loan_history' if schema_version(conn) >= 7 else 'issued'
+    conn.execute('DELETE FROM book_stats')
+    conn.execute('DELETE FROM borrower_stats')
+    conn.execute('DELETE FROM daily_circulation')
+    conn.execute(f'''
+        INSERT INTO book_stats (book_id, times_borrowed, active_loans)
+        SELECT book_id, COUNT(*), SUM(returned = 0) FROM {loans} GROUP BY book_id
+    ''')
+    conn.execute(f'''
+        INSERT INTO borrower_stats (borrower_id, total_loans, active_loans)
+        SELECT borrower_id, COUNT(*), SUM(returned = 0) FROM {loans} GROUP BY borrower_id
+    ''')
+    conn.execute(f'''
+        INSERT INTO daily_circulation (day, issued)
+        SELECT issue_date, COUNT(*) FROM {loans} WHERE issue_date IS NOT NULL GROUP BY issue_date
+    ''')
+    conn.execute(f'''
+        INSERT INTO daily_circulation (day, returned)
+        SELECT returned_date, COUNT(*) FROM {loans} WHERE returned_date IS NOT NULL GROUP BY returned_date
+        ON CONFLICT(day) DO UPDATE SET returned = excluded.returned
+    ''')
+
+def _report(name, params):
+    with get_pool().connection() as conn:
+        return conn.execute(HOT_QUERIES[name][0], params).fetchall()
+
+@timed()
+def get_overdue_loans(today=None, limit=-1):
+    return _report('overdue_loans', (today or datetime.now().strftime("%Y-%m-%d"), limit))
+
+@timed()
+def get_top_borrowed(limit=10):
+    return _report('top_borrowed', (limit,))
+
+@timed()
+def get_borrower_load(limit=10):
+    return _report('borrower_load', (limit,))
+
+@timed()
+def get_daily_circulation(days=30):
+    with get_pool().connection() as conn:
+        return conn.execute('SELECT day, issued, returned FROM daily_circulation ORDER BY day DESC LIMIT ?',
+                            (days,)).fetchall()
+
+@timed()
+def get_utilization():
+    # Share of all copies that is out on loan right now
+    with get_pool().connection() as conn:
+        on_loan = conn.execute('SELECT COALESCE(SUM(active_loans), 0) FROM book_stats').fetchone()[0]
+        on_shelf = conn.execute('SELECT COALESCE(SUM(quantity), 0) FROM books').fetchone()[0]
+    total = on_loan + on_shelf
+    return {'on_loan': on_loan, 'on_shelf': on_shelf, 'utilization': on_loan / total if total else 0.0}
+
+# --- ARCHIVE ---
+
+@retry_busy
+def _archive_chunk(conn, before, chunk_size):
+    # One committed chunk; retried on its own so the chunks before it stay counted
+    with transaction(conn):
+        ids = conn.execute(HOT_QUERIES['archivable'][0], (before, chunk_size)).fetchall()
+        conn.executemany('''
+            INSERT INTO issued_archive (id, book_id, borrower_id, issue_date, due_date, returned, returned_date)
+            SELECT id, book_id, borrower_id, issue_date, due_date, returned, returned_date
+            FROM issued WHERE id=?
+        ''', ids)
+        conn.executemany('DELETE FROM issued WHERE id=?', ids)
+    return len(ids)
+
+@timed()
+def archive_loans(before=None, chunk_size=5000):
+    # Move loans returned before the cutoff date to issued_archive. Each chunk is
+    # its own short transaction so the desks are never blocked for long.
+    before = before or (datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS)).strftime("%Y-%m-%d")
+    moved = 0
+    try:
+        with get_pool().connection() as conn:
+            while True:
+                count = _archive_chunk(conn, before, chunk_size)
+                moved += count
+                if count < chunk_size:
+                    break
+    finally:
+        # Also when a later chunk fails: the ones before it are already gone
+        if moved:
+            _notify([Change('issued', 'reload', None)])
+    return moved
+
+@timed()
+def count_archived():
+    return _count('issued_archive')
+
+@timed()
+def get_loan_history(borrower_id=None, book_id=None, limit=100, offset=0):
+    # Open, recent and archived loans, newest first
+    if borrower_id is not None:
+        where, params = 'WHERE loan_history.borrower_id = ?', (borrower_id,)
+    elif book_id is not None:
+        where, params = 'WHERE loan_history.book_id = ?', (book_id,)
+    else:
+        where, params = '', ()
+    with get_pool().connection() as conn:
+        return conn.execute(f'{HISTORY_SELECT} {where} ORDER BY loan_history.id DESC LIMIT ? OFFSET ?',
+                            params + (limit, offset)).fetchall()
+
+# --- CSV IMPORT / EXPORT ---
+
+BOOK_CSV_FIELDS = ['Title', 'Author', 'Year', 'ISBN', 'Quantity']
+ISSUED_CSV_FIELDS = ['ID', 'Book ID', 'Title', 'Borrower ID', 'Borrower', 'Issue Date', 'Due Date', 'Returned',
+                     'Returned Date']
+
+# Catalog files without a Quantity column leave the stock of known books alone
+UPSERT_BOOK = '''
+    INSERT INTO books (title, author, isbn, quantity, year) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(isbn) DO UPDATE SET title=excluded.title, author=excluded.author, year=excluded.year
+'''
+UPSERT_BOOK_WITH_QUANTITY = UPSERT_BOOK + ', quantity=excluded.quantity'
+
+ImportResult = namedtuple('ImportResult', 'rows skipped seconds')
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _book_from_csv(record, default_quantity):
+    title = (record.get('title') or '').strip()
+    author = (record.get('author') or '').strip()
+    if not title or not author:
+        return None
+    isbn = (record.get('isbn') or '').strip() or None
+    year = (record.get('year') or '').strip()
+    quantity = (record.get('quantity') or '').strip()
+    return (title, author, isbn,
+            int(quantity) if quantity.isdigit() else default_quantity,
+            int(year) if year.lstrip('-').isdigit() else None)
+
+@retry_busy
+def _import_chunk(conn, sql, books):
+    # Retried on its own: earlier chunks are already committed, and rerunning
+    # the whole import would insert the rows without an isbn a second time
+    with transaction(conn):
+        conn.executemany(sql, books)
+
+@timed()
+def import_books_csv(path, chunk_size=5000, default_quantity=1):
+    # Streams the file, one executemany + commit per chunk, upserting on isbn
+    start = time.perf_counter()
+    imported = skipped = 0
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.reader(file)
+        header = [name.strip().lower() for name in next(reader, [])]
+        sql = UPSERT_BOOK_WITH_QUANTITY if 'quantity' in header else UPSERT_BOOK
+        with get_pool().connection() as conn:
+            for chunk in _chunks((_book_from_csv(dict(zip(header, values)), default_quantity)
+                                  for values in reader), chunk_size):
+                books = [book for book in chunk if book is not None]
+                skipped += len(chunk) - len(books)
+                _import_chunk(conn, sql, books)
+                imported += len(books)
+    if imported:
+        _notify([Change('books', 'reload', None)])
+    return ImportResult(imported, skipped, time.perf_counter() - start)
+
+def _export_query(path, fields, sql, chunk_size):
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(fields)
+        with get_pool().connection() as conn:
+            cursor = conn.execute(sql)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                writer.writerows(rows)
+                written += len(rows)
+    return written
+
+@timed()
+def export_books_csv(path, chunk_size=5000):
+    return _export_query(path, BOOK_CSV_FIELDS,
+                         'SELECT title, author, year, isbn, quantity FROM books ORDER BY id', chunk_size)
+
+@timed()
+def export_issued_csv(path, chunk_size=5000):
+    # Archived loans included, this is the full issue history
+    return _export_query(path, ISSUED_CSV_FIELDS, '''
+        SELECT loan_history.id, loan_history.book_id, books.title, loan_history.borrower_id, borrowers.name,
+               loan_history.issue_date, loan_history.due_date, loan_history.returned, loan_history.returned_date
+        FROM loan_history
+        LEFT JOIN books ON loan_history.book_id = books.id
+        LEFT JOIN borrowers ON loan_history.borrower_id = borrowers.id
+        ORDER BY loan_history.id
+    ''', chunk_size)
+
+# --- GUI CLASSES ---
+
+class DbWorker:
+    # Runs database calls on a small thread pool. Results are queued and picked up
+    # by an after() poll, so callbacks always run on the Tk thread. Submitting with
+    # a key supersedes the previous request with the same key.
+    def __init__(self, root, max_workers=2, poll_ms=20):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="library-db")
+        self.results = queue.SimpleQueue()
+        self.latest = {}
+        self.busy = 0
+        self.on_busy = None
+        self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None):
+        ticket = object()
+        if key is not None:
+            previous = self.latest.get(key)
+            if previous is not None:
+                previous[1].cancel()
+        future = self.executor.submit(fn, *args)
+        if key is not None:
+            self.latest[key] = (ticket, future)
+        self._set_busy(self.busy + 1)
+        future.add_done_callback(lambda f: self.results.put((key, ticket, f, on_done, on_error)))
+        return future
+
+    def call_soon(self, fn, *args):
+        # Thread-safe way to get fn(*args) run on the Tk thread
+        self.results.put((None, None, None, fn, args))
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    item = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                # A failing callback is reported like any Tk callback error and
+                # must not stop the results behind it from being delivered
+                try:
+                    self._dispatch(*item)
+                except Exception:
+                    self.root.report_callback_exception(*sys.exc_info())
+        finally:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def _dispatch(self, key, ticket, future, on_done, on_error):
+        if future is None:
+            on_done(*on_error)
+            return
+        self._set_busy(self.busy - 1)
+        if key is not None:
+            current = self.latest.get(key)
+            if current is None or current[0] is not ticket:
+                return  # superseded by a newer request
+            del self.latest[key]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                on_error(error)
+            else:
+                messagebox.showerror("Error", str(error))
+        elif on_done is not None:
+            on_done(future.result())
+
+    def _set_busy(self, busy):
+        self.busy = busy
+        if self.on_busy is not None:
+            self.on_busy(busy > 0)
+
+    def shutdown(self):
+        self.root.after_cancel(self._after_id)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class PagedSource:
+    # Row source for VirtualTreeview, keeps the last few pages in memory.
+    # fetch() only touches the database so it can run on a DbWorker thread;
+    # every other method belongs to the Tk thread.
+    def __init__(self, fetch_page, count, page_size=200, max_pages=20):
+        self.fetch_page = fetch_page
+        self.count = count
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.version = 0
+        self.invalidate()
+
+    def invalidate(self):
+        self._pages = OrderedDict()
+        self.total = None
+        self.version += 1
+
+    def __len__(self):
+        if self.total is None:
+            self.total = self.count()
+        return self.total
+
+    def missing_pages(self, start, stop):
+        # (page number, keyset anchor) for each page of the range not in memory
+        if self.total is not None:
+            stop = min(stop, self.total)
+        missing = []
+        if stop <= start:
+            return missing
+        for number in range(start // self.page_size, (stop - 1) // self.page_size + 1):
+            if number not in self._pages:
+                previous = self._pages.get(number - 1)
+                missing.append((number, previous[-1][0] if previous else None))
+        return missing
+
+    def is_loaded(self, start, stop):
+        return self.total is not None and not self.missing_pages(start, stop)
+
+    def fetch(self, missing, with_count=False):
+        total = self.count() if with_count else None
+        pages = {}
+        for number, after_id in missing:
+            if after_id is not None:
+                pages[number] = self.fetch_page(self.page_size, after_id=after_id)
+            else:
+                pages[number] = self.fetch_page(self.page_size, offset=number * self.page_size)
+        return total, pages
+
+    def store(self, total, pages):
+        if total is not None:
+            self.total = total
+        for number, rows in pages.items():
+            self._pages[number] = rows
+            self._pages.move_to_end(number)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def page(self, number):
+        if number not in self._pages:
+            previous = self._pages.get(number - 1)
+            self.store(*self.fetch([(number, previous[-1][0] if previous else None)]))
+        self._pages.move_to_end(number)
+        return self._pages[number]
+
+    def update(self, row):
+        # Patch a changed row in whichever cached page holds it
+        self.version += 1
+        for rows in self._pages.values():
+            if rows and rows[0][0] <= row[0] <= rows[-1][0]:
+                index = bisect_left(rows, row[0], key=lambda r: r[0])
+                if index < len(rows) and rows[index][0] == row[0]:
+                    rows[index] = row
+                return
+
+    def append(self, row):
+        # New rows get the highest id, so they always land at the end
+        self.version += 1
+        if self.total is None:
+            return
+        number, index = divmod(self.total, self.page_size)
+        self.total += 1
+        page = self._pages.get(number)
+        if page is not None and len(page) == index:
+            page.append(row)
+
+    def rows(self, start, stop):
+        result = []
+        number = start // self.page_size
+        while start < stop:
+            page = self.page(number)
+            begin = start - number * self.page_size
+            chunk = page[begin:begin + stop - start]
+            if not chunk:
+                break
+            result.extend(chunk)
+            start += len(chunk)
+            number += 1
+        return result
+
+class ListSource:
+    # Rows that are already in memory, e.g. search results, behind the PagedSource interface
+    def __init__(self, rows):
+        self.all_rows = list(rows)
+        self.positions = {row[0]: i for i, row in enumerate(self.all_rows)}
+        self.total = len(self.all_rows)
+        self.version = 0
+
+    def __len__(self):
+        return self.total
+
+    def invalidate(self):
+        pass
+
+    def is_loaded(self, start, stop):
+        return True
+
+    def rows(self, start, stop):
+        return self.all_rows[start:stop]
+
+    def update(self, row):
+        if row[0] in self.positions:
+            self.all_rows[self.positions[row[0]]] = row
+
+    def append(self, row):
+        pass
+
+class VirtualTreeview(tk.Frame):
+    # Treeview that only holds the rows on screen. The item slots are reused
+    # while scrolling, so the cost of a refresh does not depend on table size.
+    # With a DbWorker, missing pages are fetched in the background and the
+    # latest scroll position wins.
+    def __init__(self, parent, columns, source, format_row=None, worker=None):
+        super().__init__(parent)
+        self.source = source
+        self.format_row = format_row or (lambda row: row)
+        self.worker = worker
+        self.top = 0
+        self.visible = 0
+        self.slots = []
+        self.slot_keys = {}
+        self.selected_key = None
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", selectmode="browse")
+        for col in columns:
+            self.tree.heading(col, text=col)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+        self.tree.bind("<Prior>", lambda e: self.scroll(-1, "pages"))
+        self.tree.bind("<Next>", lambda e: self.scroll(1, "pages"))
+
+    def row_count(self):
+        if self.worker is None:
+            return len(self.source)
+        return self.source.total or 0
+
+    def on_resize(self, event):
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or 20
+        visible = max(1, (event.height - 25) // int(row_height))
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def on_select(self, event):
+        selected = self.tree.selection()
+        if selected and selected[0] in self.slot_keys:
+            self.selected_key = self.slot_keys[selected[0]]
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.row_count()))
+        else:
+            self.scroll(int(amount), unit)
+
+    def scroll(self, amount, unit):
+        step = max(1, self.visible - 1) if unit == "pages" else 3
+        self.scroll_to(self.top + amount * step)
+        return "break"
+
+    def scroll_to(self, top):
+        top = max(0, min(top, self.row_count() - self.visible))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def update_row(self, row):
+        self.source.update(row)
+        for slot, key in self.slot_keys.items():
+            if key == row[0]:
+                self.tree.item(slot, values=self.format_row(row))
+                break
+
+    def append_row(self, row):
+        self.source.append(row)
+        if self.row_count() - 1 < self.top + self.visible:
+            self.render()
+        else:
+            self.update_scrollbar()
+
+    def refresh(self):
+        self.source.invalidate()
+        self.render()
+
+    def set_source(self, source):
+        self.source = source
+        self.top = 0
+        self.render()
+
+    def load(self):
+        source = self.source
+        version = source.version
+
+        def loaded(result):
+            if source.version == version:
+                source.store(*result)
+            self.render()
+
+        self.worker.submit(source.fetch, source.missing_pages(self.top, self.top + self.visible),
+                           source.total is None, on_done=loaded, key=self)
+
+    @timed('ui.render')
+    def render(self):
+        if self.source.total is not None:
+            self.top = max(0, min(self.top, self.source.total - self.visible))
+        if self.worker is not None and not self.source.is_loaded(self.top, self.top + self.visible):
+            self.load()
+            return
+        self.top = max(0, min(self.top, len(self.source) - self.visible))
+        rows = self.source.rows(self.top, self.top + self.visible)
+        while len(self.slots) < len(rows):
+            self.slots.append(self.tree.insert("", "end"))
+        self.slot_keys = {}
+        reselect = ()
+        for index, (slot, row) in enumerate(zip(self.slots, rows)):
+            self.tree.item(slot, values=self.format_row(row))
+            self.tree.move(slot, "", index)
+            self.slot_keys[slot] = row[0]
+            if row[0] == self.selected_key:
+                reselect = (slot,)
+        for slot in self.slots[len(rows):]:
+            self.tree.detach(slot)
+        self.tree.selection_set(reselect)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        total = self.row_count()
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+class SearchBar(tk.Frame):
+    # As-you-type search for a VirtualTreeview. Typing is debounced, the query runs
+    # on the worker and the view shows the ranked matches until the box is cleared.
+    def __init__(self, parent, view, search, worker, delay_ms=250):
+        super().__init__(parent)
+        self.view = view
+        self.search = search
+        self.worker = worker
+        self.delay_ms = delay_ms
+        self.table_source = view.source
+        self.text = ""
+        self.pending = None
+
+        self.var = tk.StringVar()
+        tk.Label(self, text="Search:").pack(side="left", padx=5)
+        tk.Entry(self, textvariable=self.var, width=40).pack(side="left", fill="x", expand=True)
+        self.var.trace_add("write", self.on_change)
+
+    def on_change(self, *args):
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+        self.pending = self.after(self.delay_ms, self.run)
+
+    def run(self):
+        self.pending = None
+        self.text = text = self.var.get().strip()
+        if not text:
+            self.view.set_source(self.table_source)
+            self.view.refresh()
+            return
+        self.worker.submit(self.search, text, key=self, on_done=lambda rows: self.show(text, rows))
+
+    @timed('ui.search_results')
+    def show(self, text, rows):
+        if text == self.text:
+            self.view.set_source(ListSource(rows))
+
+    def refresh(self):
+        if self.text:
+            self.run()
+        else:
+            self.view.refresh()
+
+class LookupCombobox(ttk.Combobox):
+    # Editable combobox that only holds the top matches for what was typed. The
+    # selection is tracked by row id, so nothing is parsed back out of the text.
+    def __init__(self, parent, lookup, format_row, worker, delay_ms=200, **kwargs):
+        self.var = tk.StringVar()
+        super().__init__(parent, textvariable=self.var, **kwargs)
+        self.lookup = lookup
+        self.format_row = format_row
+        self.worker = worker
+        self.delay_ms = delay_ms
+        self.choices = {}
+        self.pending = None
+        self.bind("<KeyRelease>", self.on_key)
+
+    def on_key(self, event):
+        if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+            return
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+        self.pending = self.after(self.delay_ms, self.reload)
+
+    def reload(self):
+        self.pending = None
+        self.worker.submit(self.lookup, self.var.get(), key=self, on_done=self.show)
+
+    @timed('ui.lookup_results')
+    def show(self, rows):
+        self.choices = {self.format_row(row): row[0] for row in rows}
+        self['values'] = list(self.choices)
+
+    def selected_id(self):
+        return self.choices.get(self.var.get())
+
+    def patch(self, row):
+        # Refresh the entry for one changed row if it is among the current matches
+        for text, key in self.choices.items():
+            if key == row[0]:
+                new_text = self.format_row(row)
+                self.choices = {new_text if k == key else t: k for t, k in self.choices.items()}
+                self['values'] = list(self.choices)
+                if self.var.get() == text:
+                    self.var.set(new_text)
+                break
+
+class LibraryApp(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("Library Book Management System")
+        self.geometry("900x600")
+
+        # Database work runs on worker threads, the status bar shows when it is busy
+        self.worker = DbWorker(self)
+        self.status = tk.Label(self, text="Ready", anchor="w")
+        self.status.pack(side="bottom", fill="x")
+        self.worker.on_busy = self.show_busy
+
+        tabControl = ttk.Notebook(self)
+        self.book_tab = BookTab(tabControl, self.worker)
+        self.borrower_tab = BorrowerTab(tabControl, self.worker)
+        self.issue_tab = IssueTab(tabControl, self.worker)
+        self.reports_tab = ReportsTab(tabControl, self.worker)
+
+        tabControl.add(self.book_tab, text="Books")
+        tabControl.add(self.borrower_tab, text="Borrowers")
+        tabControl.add(self.issue_tab, text="Issue/Return")
+        tabControl.add(self.reports_tab, text="Reports")
+        tabControl.pack(expand=1, fill="both")
+
+        # Writes report row-level changes, each tab patches just those rows
+        subscribe(self.on_data_changed)
+
+        # F12 writes the timing metrics collected so far
+        self.bind("<F12>", self.dump_metrics)
+
+    def dump_metrics(self, event=None):
+        path = metrics.dump(METRICS_FILE)
+        self.status.configure(text=f"Metrics written to {path}")
+
+    def show_busy(self, busy):
+        self.status.configure(text="Loading..." if busy else "Ready")
+        self.configure(cursor="watch" if busy else "")
+
+    def on_data_changed(self, changes):
+        # Writes commit on worker threads, hand the deltas over to the Tk thread
+        self.worker.call_soon(self.apply_changes, changes)
+
+    @timed('ui.apply_changes')
+    def apply_changes(self, changes):
+        for tab in (self.book_tab, self.borrower_tab, self.issue_tab):
+            tab.apply_changes(changes)
+
+    def destroy(self):
+        unsubscribe(self.on_data_changed)
+        self.worker.shutdown()
+        super().destroy()
+
+class BookTab(tk.Frame):
+    def __init__(self, parent, worker):
+        super().__init__(parent)
+        self.worker = worker
+        # Form
+        form = tk.Frame(self)
+        form.pack(pady=10)
+
+        tk.Label(form, text="Title:").grid(row=0, column=0, padx=5, pady=5)
+        tk.Label(form, text="Author:").grid(row=1, column=0, padx=5, pady=5)
+        tk.Label(form, text="ISBN:").grid(row=2, column=0, padx=5, pady=5)
+        tk.Label(form, text="Quantity:").grid(row=3, column=0, padx=5, pady=5)
+
+        self.title_var = tk.StringVar()
+        self.author_var = tk.StringVar()
+        self.isbn_var = tk.StringVar()
+        self.quantity_var = tk.IntVar()
+
+        tk.Entry(form, textvariable=self.title_var).grid(row=0, column=1)
+        tk.Entry(form, textvariable=self.author_var).grid(row=1, column=1)
+        tk.Entry(form, textvariable=self.isbn_var).grid(row=2, column=1)
+        tk.Entry(form, textvariable=self.quantity_var).grid(row=3, column=1)
+
+        tk.Button(form, text="Add Book", command=self.add_book).grid(row=4, column=0, columnspan=2, pady=10)
+
+        # Treeview for books, only the visible page is loaded
+        self.view = VirtualTreeview(self, ("ID", "Title", "Author", "ISBN", "Quantity", "Year"),
+                                    PagedSource(get_books_page, count_books), worker=worker)
+        self.search_bar = SearchBar(self, self.view, search_books, worker)
+        self.search_bar.pack(fill="x", padx=10)
+        self.view.pack(expand=True, fill="both", pady=10)
+        self.tree = self.view.tree
+
+        self.load_books()
+
+    def add_book(self):
+        title = self.title_var.get()
+        author = self.author_var.get()
+        isbn = self.isbn_var.get()
+        quantity = self.quantity_var.get()
+
+        if not title or not author or not isbn or quantity <= 0:
+            messagebox.showerror("Error", "Please fill all fields with valid data.")
+            return
+
+        self.worker.submit(add_book, title, author, isbn, quantity, on_done=self.book_added,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to add book: {e}"))
+
+    def book_added(self, result):
+        messagebox.showinfo("Success", "Book added successfully.")
+        self.clear_fields()
+
+    def load_books(self):
+        self.search_bar.refresh()
+
+    def apply_changes(self, changes):
+        for change in changes:
+            if change.table != 'books':
+                continue
+            if change.op == 'reload':
+                self.load_books()
+            elif change.op == 'insert':
+                self.view.append_row(change.row)
+            else:
+                self.view.update_row(change.row)
+
+    def clear_fields(self):
+        self.title_var.set("")
+        self.author_var.set("")
+        self.isbn_var.set("")
+        self.quantity_var.set(0)
+
+class BorrowerTab(tk.Frame):
+    def __init__(self, parent, worker):
+        super().__init__(parent)
+        self.worker = worker
+        form = tk.Frame(self)
+        form.pack(pady=10)
+
+        tk.Label(form, text="Name:").grid(row=0, column=0, padx=5, pady=5)
+        tk.Label(form, text="Contact:").grid(row=1, column=0, padx=5, pady=5)
+
+        self.name_var = tk.StringVar()
+        self.contact_var = tk.StringVar()
+
+        tk.Entry(form, textvariable=self.name_var).grid(row=0, column=1)
+        tk.Entry(form, textvariable=self.contact_var).grid(row=1, column=1)
+
+        tk.Button(form, text="Add Borrower", command=self.add_borrower).grid(row=2, column=0, columnspan=2, pady=10)
+
+        self.view = VirtualTreeview(self, ("ID", "Name", "Contact"),
+                                    PagedSource(get_borrowers_page, count_borrowers), worker=worker)
+        self.search_bar = SearchBar(self, self.view, search_borrowers, worker)
+        self.search_bar.pack(fill="x", padx=10)
+        self.view.pack(expand=True, fill="both", pady=10)
+        self.tree = self.view.tree
+
+        self.load_borrowers()
+
+    def add_borrower(self):
+        name = self.name_var.get()
+        contact = self.contact_var.get()
+
+        if not name:
+            messagebox.showerror("Error", "Name is required.")
+            return
+
+        self.worker.submit(add_borrower, name, contact, on_done=self.borrower_added,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to add borrower: {e}"))
+
+    def borrower_added(self, result):
+        messagebox.showinfo("Success", "Borrower added successfully.")
+        self.clear_fields()
+
+    def load_borrowers(self):
+        self.search_bar.refresh()
+
+    def apply_changes(self, changes):
+        for change in changes:
+            if change.table != 'borrowers':
+                continue
+            if change.op == 'reload':
+                self.load_borrowers()
+            elif change.op == 'insert':
+                self.view.append_row(change.row)
+            else:
+                self.view.update_row(change.row)
+
+    def clear_fields(self):
+        self.name_var.set("")
+        self.contact_var.set("")
+
+class IssueTab(tk.Frame):
+    def __init__(self, parent, worker):
+        super().__init__(parent)
+        self.worker = worker
+
+        # Issue book frame
+        issue_frame = tk.LabelFrame(self, text="Issue Book")
+        issue_frame.pack(fill="x", padx=10, pady=10)
+
+        tk.Label(issue_frame, text="Select Book:").grid(row=0, column=0, padx=5, pady=5)
+        tk.Label(issue_frame, text="Select Borrower:").grid(row=1, column=0, padx=5, pady=5)
+        tk.Label(issue_frame, text="Due Days (from today):").grid(row=2, column=0, padx=5, pady=5)
+
+        self.due_days_var = tk.IntVar(value=7)
+
+        # Type an id or the start of a title/name, matches are looked up as you type
+        self.book_combo = LookupCombobox(issue_frame, find_books, self.format_book, worker, width=50)
+        self.borrower_combo = LookupCombobox(issue_frame, find_borrowers, self.format_borrower, worker, width=50)
+        self.book_var = self.book_combo.var
+        self.borrower_var = self.borrower_combo.var
+        self.book_combo.grid(row=0, column=1, padx=5, pady=5)
+        self.borrower_combo.grid(row=1, column=1, padx=5, pady=5)
+        tk.Entry(issue_frame, textvariable=self.due_days_var, width=5).grid(row=2, column=1, padx=5, pady=5, sticky="w")
+
+        tk.Button(issue_frame, text="Issue Book", command=self.issue_book).grid(row=3, column=0, columnspan=2, pady=10)
+
+        # Issued books treeview
+        issued_frame = tk.LabelFrame(self, text="Issued Books")
+        issued_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.view = VirtualTreeview(issued_frame, ("ID", "Book Title", "Borrower", "Issue Date", "Due Date", "Returned"),
+                                    PagedSource(get_issued_page, count_issued), format_row=self.format_issued,
+                                    worker=worker)
+        self.view.pack(fill="both", expand=True)
+        self.tree = self.view.tree
+
+        # Return book button
+        tk.Button(self, text="Return Selected Book", command=self.return_book).pack(pady=10)
+
+        self.load_books_and_borrowers()
+        self.load_issued_books()
+
+    def format_book(self, b):
+        return f"{b[0]}: {b[1]} (Qty: {b[4]})"
+
+    def format_borrower(self, b):
+        return f"{b[0]}: {b[1]}"
+
+    def load_books_and_borrowers(self):
+        self.book_combo.reload()
+        self.borrower_combo.reload()
+
+    def apply_changes(self, changes):
+        for change in changes:
+            if change.table == 'issued':
+                if change.op == 'reload':
+                    self.load_issued_books()
+                elif change.op == 'insert':
+                    self.view.append_row(change.row)
+                else:
+                    self.view.update_row(change.row)
+            elif change.op == 'reload':
+                self.load_books_and_borrowers()
+            elif change.table == 'books':
+                self.book_combo.patch(change.row)
+            elif change.table == 'borrowers':
+                self.borrower_combo.patch(change.row)
+
+    def issue_book(self):
+        book_id = self.book_combo.selected_id()
+        borrower_id = self.borrower_combo.selected_id()
+        if book_id is None or borrower_id is None:
+            messagebox.showerror("Error", "Please select a book and borrower.")
+            return
+
+        try:
+            issue_date = datetime.now().strftime("%Y-%m-%d")
+            due_days = self.due_days_var.get()
+            if due_days <= 0:
+                messagebox.showerror("Error", "Due days must be positive.")
+                return
+            due_date = (datetime.now() + timedelta(days=due_days)).strftime("%Y-%m-%d")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to issue book: {e}")
+            return
+
+        self.worker.submit(issue_book, book_id, borrower_id, issue_date, due_date, on_done=self.book_issued,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to issue book: {e}"))
+
+    def book_issued(self, result):
+        success, msg = result
+        if success:
+            messagebox.showinfo("Success", msg)
+        else:
+            messagebox.showerror("Error", msg)
+
+    def format_issued(self, row):
+        returned_str = "Yes" if row[5] else "No"
+        return (row[0], row[1], row[2], row[3], row[4], returned_str)
+
+    def load_issued_books(self):
+        self.view.refresh()
+
+    def return_book(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showerror("Error", "Please select an issued book to return.")
+            return
+        issue_id = self.tree.item(selected[0])['values'][0]
+        # Check if already returned
+        if self.tree.item(selected[0])['values'][5] == "Yes":
+            messagebox.showinfo("Info", "This book is already returned.")
+            return
+        self.worker.submit(return_book, issue_id, on_done=self.book_returned,
+                           on_error=lambda e: messagebox.showerror("Error", f"Failed to return book: {e}"))
+
+    def book_returned(self, result):
+        success, msg = result
+        if success:
+            messagebox.showinfo("Success", msg)
+        else:
+            messagebox.showinfo("Info", msg)
+
+class ReportsTab(tk.Frame):
+    def __init__(self, parent, worker):
+        super().__init__(parent)
+        self.worker = worker
+
+        top = tk.Frame(self)
+        top.pack(fill="x", padx=10, pady=10)
+        tk.Button(top, text="Refresh", command=self.refresh).pack(side="left")
+        self.utilization_label = tk.Label(top, text="")
+        self.utilization_label.pack(side="left", padx=10)
+
+        self.overdue_tree = self.add_report("Overdue Loans", ("ID", "Book Title", "Borrower", "Issue Date", "Due Date"))
+        self.top_tree = self.add_report("Most Borrowed", ("ID", "Title", "Author", "Times Borrowed", "On Loan"))
+        self.load_tree = self.add_report("Borrower Load", ("ID", "Name", "On Loan", "Total Loans"))
+
+        # Reports are cheap to query, so just reload whenever the tab is shown
+        self.bind("<Map>", lambda e: self.refresh())
+
+    def add_report(self, title, columns):
+        frame = tk.LabelFrame(self, text=title)
+        frame.pack(fill="both", expand=True, padx=10, pady=5)
+        tree = ttk.Treeview(frame, columns=columns, show="headings", height=5)
+        for col in columns:
+            tree.heading(col, text=col)
+        tree.pack(fill="both", expand=True)
+        return tree
+
+    def refresh(self):
+        self.worker.submit(lambda: (get_utilization(), get_overdue_loans(limit=200), get_top_borrowed(20),
+                                    get_borrower_load(20)), on_done=self.show, key=self)
+
+    @timed('ui.reports')
+    def show(self, result):
+        utilization, overdue, top, load = result
+        self.utilization_label.configure(
+            text=f"On loan: {utilization['on_loan']}  On shelf: {utilization['on_shelf']}  "
+                 f"Utilization: {utilization['utilization']:.0%}")
+        for tree, rows in ((self.overdue_tree, [row[:5] for row in overdue]), (self.top_tree, top),
+                           (self.load_tree, load)):
+            tree.delete(*tree.get_children())
+            for row in rows:
+                tree.insert("", "end", values=row)
+
+# --- RUN APP ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Library Book Management System")
+    parser.add_argument('--db', default=DB_NAME, help="database file (default: %(default)s)")
+    parser.add_argument('--metrics', metavar='FILE', help="write timing metrics as JSON to FILE on exit")
+    parser.add_argument('--log-slow-queries', action='store_true',
+                        help=f"log statements slower than {SLOW_QUERY_MS} ms to stderr")
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('migrate', help="upgrade the database schema and exit")
+    commands.add_parser('check-plans', help="fail if a hot query does a full table scan")
+    import_parser = commands.add_parser('import-books', help="bulk import a Title,Author,Year,ISBN catalog CSV")
+    import_parser.add_argument('file')
+    import_parser.add_argument('--chunk-size', type=int, default=5000)
+    commands.add_parser('report', help="print the circulation reports")
+    archive_parser = commands.add_parser('archive', help="move old returned loans to the archive table")
+    archive_parser.add_argument('--before', metavar='YYYY-MM-DD',
+                                help=f"archive loans returned before this date (default: {ARCHIVE_AFTER_DAYS} days ago)")
+    for name, what in (('export-books', "catalog"), ('export-issued', "issue history")):
+        export_parser = commands.add_parser(name, help=f"write the {what} to a CSV file")
+        export_parser.add_argument('file')
+    args = parser.parse_args(argv)
+
+    if args.log_slow_queries:
+        logging.basicConfig(format="%(name)s: %(message)s")
+    configure_db(args.db)
+    if args.metrics:
+        dump_metrics_at_exit(args.metrics)
+    if args.command == 'migrate':
+        with get_pool().connection() as conn:
+            print(f"{args.db}: schema version {schema_version(conn)}")
+        return 0
+    if args.command == 'check-plans':
+        problems = check_query_plans()
+        for name, scans in problems.items():
+            print(f"{name}: {'; '.join(scans)}")
+        return 1 if problems else 0
+    if args.command == 'import-books':
+        result = import_books_csv(args.file, args.chunk_size)
+        rate = result.rows / result.seconds if result.seconds else 0
+        print(f"Imported {result.rows} books in {result.seconds:.2f}s ({rate:,.0f} rows/s), "
+              f"skipped {result.skipped} invalid rows")
+        return 0
+    if args.command == 'report':
+        utilization = get_utilization()
+        print(f"On loan: {utilization['on_loan']}, on shelf: {utilization['on_shelf']}, "
+              f"utilization: {utilization['utilization']:.1%}")
+        print("Oldest overdue loans:")
+        for issue_id, title, name, issue_date, due_date, returned in get_overdue_loans(limit=20):
+            print(f"  due {due_date}  {title} -> {name}")
+        print("Most borrowed:")
+        for book_id, title, author, times_borrowed, active in get_top_borrowed():
+            print(f"  {times_borrowed:>6}  {title} ({author})")
+        print("Most books on loan:")
+        for borrower_id, name, active, total in get_borrower_load():
+            print(f"  {active:>6}  {name}")
+        return 0
+    if args.command == 'archive':
+        moved = archive_loans(args.before)
+        print(f"Archived {moved} returned loans, {count_archived()} in the archive, {count_issued()} still in issued")
+        return 0
+    if args.command in ('export-books', 'export-issued'):
+        export = export_books_csv if args.command == 'export-books' else export_issued_csv
+        print(f"Wrote {export(args.file)} rows to {args.file}")
+        return 0
+
+    app = LibraryApp()
+    app.mainloop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
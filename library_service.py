@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import library_management as lm
+
+DEFAULT_PORT = 8765
+
+# Operations the service exposes, called with the JSON object as keyword arguments
+OPERATIONS = {
+    'add_book': lm.add_book,
+    'get_books_page': lm.get_books_page,
+    'count_books': lm.count_books,
+    'search_books': lm.search_books,
+    'find_books': lm.find_books,
+    'add_borrower': lm.add_borrower,
+    'get_borrowers_page': lm.get_borrowers_page,
+    'count_borrowers': lm.count_borrowers,
+    'search_borrowers': lm.search_borrowers,
+    'find_borrowers': lm.find_borrowers,
+    'issue_book': lm.issue_book,
+    'return_book': lm.return_book,
+    'get_issued_page': lm.get_issued_page,
+    'get_open_loans': lm.get_open_loans,
+    'get_borrower_loans': lm.get_borrower_loans,
+    'get_loan_history': lm.get_loan_history,
+    'archive_loans': lm.archive_loans,
+    'get_overdue_loans': lm.get_overdue_loans,
+    'get_top_borrowed': lm.get_top_borrowed,
+    'get_borrower_load': lm.get_borrower_load,
+    'get_utilization': lm.get_utilization,
+}
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class ServiceError(Exception):
+    pass
+
+
+# --- SERVER ---
+
+class LibraryService:
+    # Small HTTP/1.1 JSON server. Requests are parsed on the event loop, the
+    # SQLite work runs on a bounded thread pool that shares one connection pool.
+    #   POST /call/<operation>   {"title": ..., ...}      -> {"result": ...}
+    #   POST /batch              [{"op": ..., "args": {...}}, ...] -> {"results": [...]}
+    #   GET  /health
+    #   GET  /metrics                                  -> timing metrics snapshot
+    def __init__(self, workers=4, max_pending=256):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="library-service")
+        self.slots = asyncio.Semaphore(max_pending)
+
+    async def run(self, fn, *args):
+        async with self.slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def call(self, op, args):
+        if op not in OPERATIONS:
+            raise KeyError(op)
+        return OPERATIONS[op](**(args or {}))
+
+    def call_batch(self, calls):
+        # One executor job for the whole batch, calls run in order
+        results = []
+        for call in calls:
+            try:
+                results.append({'result': self.call(call.get('op'), call.get('args'))})
+            except Exception as e:
+                results.append({'error': f"{type(e).__name__}: {e}"})
+        return results
+
+    async def dispatch(self, method, path, body):
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, lm.metrics.snapshot()
+        if method != 'POST':
+            return 405, {'error': "use POST"}
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError as e:
+            return 400, {'error': f"invalid JSON: {e}"}
+
+        if path == '/batch':
+            if not isinstance(payload, list):
+                return 400, {'error': "batch body must be a list of calls"}
+            return 200, {'results': await self.run(self.call_batch, payload)}
+        if path.startswith('/call/'):
+            op = path[len('/call/'):]
+            if op not in OPERATIONS:
+                return 404, {'error': f"unknown operation {op}"}
+            try:
+                return 200, {'result': await self.run(self.call, op, payload)}
+            except Exception as e:
+                return 500, {'error': f"{type(e).__name__}: {e}"}
+        return 404, {'error': f"no route for {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self.dispatch(method, path, body)
+                data = json.dumps(payload).encode()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n")
+                if not keep_alive:
+                    head += "Connection: close\r\n"
+                writer.write(head.encode('latin-1') + b'\r\n' + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+async def serve(host='127.0.0.1', port=DEFAULT_PORT, unix_path=None, workers=4):
+    service = LibraryService(workers)
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle, path=unix_path)
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+    where = unix_path or f"http://{host}:{port}"
+    print(f"Library service listening on {where}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+# --- CLIENT ---
+
+class LibraryClient:
+    # Keeps one connection open and sends requests one after another on it.
+    #   async with LibraryClient(port=8765) as client:
+    #       books = await client.call('search_books', text='python')
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, unix_path=None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.reader = None
+        self.writer = None
+        self.lock = asyncio.Lock()
+
+    async def connect(self):
+        if self.unix_path:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        async with self.lock:
+            if self.writer is None:
+                await self.connect()
+            self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                              f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                              .encode('latin-1') + body)
+            await self.writer.drain()
+            status = int((await self.reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await self.reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+            data = json.loads(await self.reader.readexactly(length))
+        if status != 200:
+            raise ServiceError(data.get('error', f"HTTP {status}"))
+        return data
+
+    async def call(self, op, **args):
+        return (await self.request('POST', f'/call/{op}', args))['result']
+
+    async def batch(self, calls):
+        # calls: [(op, {args}), ...]; failed calls come back as ServiceError instances
+        data = await self.request('POST', '/batch', [{'op': op, 'args': args} for op, args in calls])
+        return [item['result'] if 'result' in item else ServiceError(item['error']) for item in data['results']]
+
+
+# --- RUN SERVICE ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless JSON API for the library database")
+    parser.add_argument('--db', default=lm.DB_NAME, help="database file (default: %(default)s)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', metavar='PATH', help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=4, help="threads doing SQLite work")
+    args = parser.parse_args(argv)
+
+    # One pooled connection per worker thread
+    lm.configure_db(args.db, pool_size=args.workers)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
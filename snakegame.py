@@ -1,21 +1,28 @@
 import tkinter as tk
 import random
+from collections import Counter, deque
+
+HEAD_COLOR = "green"
+BODY_COLOR = "lightgreen"
 
 class SnakeGame:
-    def __init__(self, root):
+    def __init__(self, root, width=500, height=400, cell_size=20):
         self.root = root
         self.root.title("Snake Game")
 
-        self.width = 500
-        self.height = 400
-        self.cell_size = 20
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
         self.direction = 'Right'
         self.score = 0
 
         self.canvas = tk.Canvas(root, width=self.width, height=self.height, bg="black")
         self.canvas.pack()
 
-        self.snake_positions = [(100, 100), (80, 100), (60, 100)]
+        # Head first. occupied counts the snake's cells, a cell can appear
+        # twice right after the snake grows
+        self.snake_positions = deque([(100, 100), (80, 100), (60, 100)])
+        self.occupied = Counter(self.snake_positions)
         self.food_position = self.set_new_food_position()
         self.game_running = True
 
@@ -34,7 +41,7 @@ class SnakeGame:
         while True:
             x = random.randint(0, (self.width - self.cell_size) // self.cell_size) * self.cell_size
             y = random.randint(0, (self.height - self.cell_size) // self.cell_size) * self.cell_size
-            if (x, y) not in self.snake_positions:
+            if (x, y) not in self.occupied:
                 return (x, y)
 
     def change_direction(self, event):
@@ -49,14 +56,17 @@ class SnakeGame:
 
     def perform_actions(self):
         if self.game_running:
-            self.move_snake()
-            self.check_collisions()
-            self.check_food_collision()
-            self.draw_elements()
-            self.root.after(100, self.perform_actions)
+            self.tick()
+            self.after_id = self.root.after(100, self.perform_actions)
         else:
             self.game_over()
 
+    def tick(self):
+        self.move_snake()
+        self.check_collisions()
+        self.check_food_collision()
+        self.render()
+
     def move_snake(self):
         head_x, head_y = self.snake_positions[0]
 
@@ -69,7 +79,12 @@ class SnakeGame:
         else:  # Down
             new_head = (head_x, head_y + self.cell_size)
 
-        self.snake_positions = [new_head] + self.snake_positions[:-1]
+        self.snake_positions.appendleft(new_head)
+        self.occupied[new_head] += 1
+        tail = self.snake_positions.pop()
+        self.occupied[tail] -= 1
+        if not self.occupied[tail]:
+            del self.occupied[tail]
 
     def check_collisions(self):
         head_x, head_y = self.snake_positions[0]
@@ -79,7 +94,7 @@ class SnakeGame:
             self.game_running = False
 
         # Check self collision
-        if self.snake_positions[0] in self.snake_positions[1:]:
+        if self.occupied[self.snake_positions[0]] > 1:
             self.game_running = False
 
     def check_food_collision(self):
@@ -87,19 +102,42 @@ class SnakeGame:
             self.score += 1
             self.score_label.config(text=f"Score: {self.score}")
             self.snake_positions.append(self.snake_positions[-1])  # Grow snake
+            self.occupied[self.snake_positions[-1]] += 1
             self.food_position = self.set_new_food_position()
 
+    def cell(self, position):
+        x, y = position
+        return x, y, x + self.cell_size, y + self.cell_size
+
     def draw_elements(self):
+        # Full redraw; the canvas items are then kept and moved by render()
         self.canvas.delete(tk.ALL)
 
         # Draw food
-        x, y = self.food_position
-        self.canvas.create_oval(x, y, x + self.cell_size, y + self.cell_size, fill="red", outline="")
+        self.food_item = self.canvas.create_oval(*self.cell(self.food_position), fill="red", outline="")
+        self.drawn_food = self.food_position
 
         # Draw snake
-        for i, (x, y) in enumerate(self.snake_positions):
-            color = "green" if i == 0 else "lightgreen"
-            self.canvas.create_rectangle(x, y, x + self.cell_size, y + self.cell_size, fill=color, outline="")
+        self.segments = deque(
+            self.canvas.create_rectangle(*self.cell(position), fill=HEAD_COLOR if i == 0 else BODY_COLOR, outline="")
+            for i, position in enumerate(self.snake_positions))
+
+    def render(self):
+        # One move: the tail rectangle becomes the new head, whatever the
+        # snake's length. Growth adds a rectangle at the tail and the food
+        # oval only moves when it was eaten.
+        tail = self.segments.pop()
+        self.segments.appendleft(tail)
+        self.canvas.coords(tail, *self.cell(self.snake_positions[0]))
+        if len(self.segments) > 1:
+            self.canvas.itemconfigure(tail, fill=HEAD_COLOR)
+            self.canvas.itemconfigure(self.segments[1], fill=BODY_COLOR)
+        while len(self.segments) < len(self.snake_positions):
+            position = self.snake_positions[len(self.segments)]
+            self.segments.append(self.canvas.create_rectangle(*self.cell(position), fill=BODY_COLOR, outline=""))
+        if self.drawn_food != self.food_position:
+            self.canvas.coords(self.food_item, *self.cell(self.food_position))
+            self.drawn_food = self.food_position
 
     def game_over(self):
         self.canvas.delete(tk.ALL)
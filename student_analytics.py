@@ -0,0 +1,205 @@
+import argparse
+import csv
+import sys
+from array import array
+from collections import Counter
+from itertools import compress
+
+import students_db
+
+# Row selections are masks: one byte per row, SELECTED or 0. Masks combine with
+# a single big-integer AND, and the byte columns are filtered through
+# bytes.translate, so filters run in C instead of a Python loop per row.
+SELECTED = 0xFF
+CATEGORICAL = ('gender', 'department', 'college', 'grade')
+LOAD_CHUNK = 50000
+
+
+def _and(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (int.from_bytes(a, 'little') & int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def _table(selected):
+    # translate() table: SELECTED for the byte values to keep
+    return bytes(SELECTED if i in selected else 0 for i in range(256))
+
+
+class CategoricalColumn:
+    # Dictionary-encoded column: the distinct values once, plus a small integer
+    # code per row. Codes are single bytes until there are more than 256
+    # distinct values, then the column widens to 16-bit codes.
+    def __init__(self):
+        self.values = []
+        self.lookup = {}
+        self.codes = bytearray()
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+            if code == 256:
+                self.codes = array('H', iter(self.codes))
+        self.codes.append(code)
+
+    def mask(self, wanted):
+        codes = {self.lookup[value] for value in wanted if value in self.lookup}
+        if isinstance(self.codes, bytearray):
+            return bytes(self.codes.translate(_table(codes)))
+        return bytes(SELECTED if code in codes else 0 for code in self.codes)
+
+    def counts(self, mask=None):
+        codes = self.codes if mask is None else compress(self.codes, mask)
+        return {self.values[code]: count for code, count in Counter(codes).most_common()}
+
+    def nbytes(self):
+        return len(self.codes) * (1 if isinstance(self.codes, bytearray) else self.codes.itemsize)
+
+
+class StudentColumns:
+    # Student data held column by column: ids as 32-bit integers, ages as one
+    # byte each (0 when unknown) and the categorical columns dictionary-encoded.
+    # Names stay in the database; use ids() to fetch the matching rows.
+    def __init__(self):
+        self.id = array('I')
+        self.age = bytearray()
+        self.columns = {name: CategoricalColumn() for name in CATEGORICAL}
+
+    def __len__(self):
+        return len(self.id)
+
+    def append(self, student_id, age, gender=None, department=None, college=None, grade=None):
+        self.id.append(student_id)
+        self.age.append(min(age or 0, 255))
+        for name, value in zip(CATEGORICAL, (gender, department, college, grade)):
+            self.columns[name].append(value)
+
+    @classmethod
+    def from_db(cls, db, chunk_size=LOAD_CHUNK):
+        table = cls()
+        for chunk in db.scan(chunk_size):
+            for student in chunk:
+                table.append(student.id, student.age, student.gender, student.department, student.college,
+                             student.grade)
+        return table
+
+    @classmethod
+    def from_csv(cls, path):
+        # Straight from a students.csv in either legacy layout, row numbers as ids
+        table = cls()
+        with open(path, newline='', encoding='utf-8', errors='replace') as file:
+            for number, row in enumerate(csv.reader(file), 1):
+                row = students_db.legacy_row(row)
+                if row and row[0] and row[0] != 'Name':
+                    table.append(number, *row[1:])
+        return table
+
+    def nbytes(self):
+        return (len(self.id) * self.id.itemsize + len(self.age)
+                + sum(column.nbytes() for column in self.columns.values()))
+
+    # --- FILTERS ---
+
+    def where(self, age=None, **filters):
+        # age: an exact age or an inclusive (low, high) range. Other keywords
+        # name a categorical column and take one value or a list of values.
+        # Returns a mask, None meaning every row.
+        mask = None
+        if age is not None:
+            low, high = age if isinstance(age, tuple) else (age, age)
+            mask = bytes(self.age.translate(_table(range(max(low, 1), min(high, 255) + 1))))
+        for name, wanted in filters.items():
+            if name not in self.columns:
+                raise KeyError(f"no categorical column {name}")
+            wanted = [wanted] if isinstance(wanted, str) or wanted is None else wanted
+            mask = _and(mask, self.columns[name].mask(wanted))
+        return mask
+
+    def count(self, mask=None):
+        return len(self) if mask is None else mask.count(SELECTED)
+
+    def ids(self, mask=None):
+        return list(self.id) if mask is None else list(compress(self.id, mask))
+
+    # --- AGGREGATES ---
+
+    def group_count(self, column, mask=None):
+        # {value: rows}, largest group first
+        return self.columns[column].counts(mask)
+
+    def group_mean_age(self, column, mask=None):
+        # {value: mean age}, over rows with a known age
+        known = _and(mask, bytes(self.age.translate(_table(range(1, 256)))))
+        categorical = self.columns[column]
+        # One pass counting (code, age) pairs, then a sum per distinct pair
+        pairs = Counter(zip(compress(categorical.codes, known), compress(self.age, known)))
+        rows, total = Counter(), Counter()
+        for (code, age), count in pairs.items():
+            rows[code] += count
+            total[code] += age * count
+        return {categorical.values[code]: total[code] / rows[code] for code in rows}
+
+    def age_histogram(self, mask=None, width=1):
+        # {bucket start: rows}, rows without an age left out
+        ages = self.age if mask is None else compress(self.age, mask)
+        histogram = Counter()
+        for age, count in Counter(ages).items():
+            if age:
+                histogram[age - age % width] += count
+        return dict(sorted(histogram.items()))
+
+
+def parse_filters(terms):
+    # "department=CSE,ECE" "age=18-25" -> keyword arguments for where()
+    filters = {}
+    for term in terms:
+        name, _, value = term.partition('=')
+        if name == 'age':
+            low, _, high = value.partition('-')
+            filters['age'] = (int(low), int(high or low))
+        else:
+            filters[name] = value.split(',')
+    return filters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Counts and aggregates over the student data")
+    parser.add_argument('--db', default=students_db.DB_NAME, help="student database (default: %(default)s)")
+    parser.add_argument('--csv', help="read a students.csv instead of the database")
+    parser.add_argument('--where', nargs='*', default=[], metavar='COLUMN=VALUE',
+                        help="filters, e.g. department=CSE,ECE age=18-25")
+    parser.add_argument('--group', choices=CATEGORICAL, default='department', help="column to group by")
+    parser.add_argument('--histogram', type=int, metavar='WIDTH', help="also print an age histogram")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        table = StudentColumns.from_csv(args.csv)
+    else:
+        db = students_db.StudentDB(args.db)
+        table = StudentColumns.from_db(db)
+        db.close()
+    mask = table.where(**parse_filters(args.where))
+
+    print(f"{table.count(mask)} of {len(table)} students ({table.nbytes() / 1e6:.1f} MB in columns)")
+    means = table.group_mean_age(args.group, mask)
+    print(f"{args.group:<24}{'students':>10}{'mean age':>10}")
+    for value, count in table.group_count(args.group, mask).items():
+        mean = f"{means[value]:.1f}" if value in means else "-"
+        print(f"{str(value):<24}{count:>10}{mean:>10}")
+    if args.histogram:
+        print(f"\n{'age':<8}{'students':>10}")
+        for age, count in table.age_histogram(mask, args.histogram).items():
+            label = f"{age}-{age + args.histogram - 1}" if args.histogram > 1 else str(age)
+            print(f"{label:<8}{count:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+import csv
+import os
+import sqlite3
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+
+DB_NAME = 'students.db'
+LEGACY_CSV = 'students.csv'
+LEGACY_LOG = 'students.log'
+CHUNK_SIZE = 2000
+
+# One schema for both student apps. studentdata.py fills in gender, department
+# and college; texteditor.py fills in grade. Missing fields are NULL.
+Student = namedtuple('Student', 'id name age gender department college grade')
+FIELDS = Student._fields[1:]
+
+# Schema versions, tracked in PRAGMA user_version
+MIGRATIONS = [
+    (1, [
+        '''
+            CREATE TABLE students (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                age INTEGER CHECK (age IS NULL OR age > 0),
+                gender TEXT,
+                department TEXT,
+                college TEXT,
+                grade TEXT
+            )
+        ''',
+        'CREATE INDEX idx_students_name ON students(name)',
+        'CREATE INDEX idx_students_department ON students(department)',
+        # Remembers which legacy files were already imported
+        'CREATE TABLE imported_files (path TEXT PRIMARY KEY, rows INTEGER NOT NULL)',
+    ]),
+]
+
+
+def _age(value):
+    try:
+        age = int(str(value).strip())
+    except ValueError:
+        return None
+    return age if age > 0 else None
+
+
+def _clean(value):
+    # Empty strings are stored as NULL
+    value = ' '.join(str(value).split()) if value is not None else ''
+    return value or None
+
+
+def legacy_row(row):
+    # students.csv holds two layouts: Name,Age,Gender,Department,College from
+    # studentdata.py and positional Name,Age,Grade from texteditor.py
+    if len(row) >= 5:
+        name, age, gender, department, college = row[:5]
+        return _clean(name), _age(age), _clean(gender), _clean(department), _clean(college), None
+    if len(row) >= 3:
+        name, age, grade = row[:3]
+        return _clean(name), _age(age), None, None, None, _clean(grade)
+    return None
+
+
+class StudentDB:
+    # Thin wrapper around one SQLite connection. Both apps are single-threaded
+    # Tk programs, WAL lets them have the same file open at the same time.
+    def __init__(self, path=DB_NAME, durable=False):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        # FULL syncs every commit, NORMAL can lose the last commits on power loss
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        self.conn.execute('PRAGMA busy_timeout=5000')
+        self.migrate()
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+
+    def migrate(self):
+        with self.transaction() as conn:
+            current = conn.execute('PRAGMA user_version').fetchone()[0]
+            for version, steps in MIGRATIONS:
+                if version <= current:
+                    continue
+                for step in steps:
+                    conn.execute(step)
+                conn.execute(f'PRAGMA user_version = {version}')
+
+    # --- WRITES ---
+
+    def add(self, name, age, gender=None, department=None, college=None, grade=None):
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                'INSERT INTO students (name, age, gender, department, college, grade) VALUES (?, ?, ?, ?, ?, ?)',
+                (_clean(name), _age(age), _clean(gender), _clean(department), _clean(college), _clean(grade)))
+        return cursor.lastrowid
+
+    def add_many(self, students):
+        # students: iterable of (name, age, gender, department, college, grade)
+        # tuples, streamed into executemany in one transaction
+        rows = ((_clean(name), _age(age), _clean(gender), _clean(department), _clean(college), _clean(grade))
+                for name, age, gender, department, college, grade in students)
+        with self.transaction() as conn:
+            return conn.executemany(
+                'INSERT INTO students (name, age, gender, department, college, grade) VALUES (?, ?, ?, ?, ?, ?)',
+                rows).rowcount
+
+    def delete(self, student_id):
+        with self.transaction() as conn:
+            return conn.execute('DELETE FROM students WHERE id=?', (student_id,)).rowcount
+
+    def delete_by_name(self, name):
+        with self.transaction() as conn:
+            return conn.execute('DELETE FROM students WHERE name=?', (name,)).rowcount
+
+    # --- READS ---
+
+    def _select(self, where='', params=()):
+        return [Student(*row) for row in self.conn.execute(
+            f'SELECT id, {", ".join(FIELDS)} FROM students {where}', params)]
+
+    def get(self, student_id):
+        rows = self._select('WHERE id=?', (student_id,))
+        return rows[0] if rows else None
+
+    def find_by_name(self, name):
+        return self._select('WHERE name=? ORDER BY id', (name,))
+
+    def by_department(self, department):
+        return self._select('WHERE department=? ORDER BY id', (department,))
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM students').fetchone()[0]
+
+    def page(self, limit, after_id=0):
+        # Keyset paging on the primary key, stable while rows come and go
+        return self._select('WHERE id > ? ORDER BY id LIMIT ?', (after_id, limit))
+
+    def scan(self, chunk_size=CHUNK_SIZE):
+        # Streams every student in insertion order, chunk_size at a time
+        after_id = 0
+        while True:
+            chunk = self.page(chunk_size, after_id)
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1].id
+
+    # --- LEGACY IMPORT ---
+
+    def _imported(self, path):
+        key = os.path.abspath(path)
+        return self.conn.execute('SELECT 1 FROM imported_files WHERE path=?', (key,)).fetchone() is not None
+
+    def import_legacy_csv(self, path=LEGACY_CSV, min_columns=3):
+        # One-time, streaming import of the old students.csv; min_columns=5
+        # takes only the studentdata rows. Returns the number of rows added,
+        # 0 if the file is missing or was imported before.
+        if not os.path.exists(path) or self._imported(path):
+            return 0
+        with open(path, newline='', encoding='utf-8', errors='replace') as file, self.transaction() as conn:
+            # Checked again under the write lock: another instance starting at
+            # the same time may have imported it since
+            if self._imported(path):
+                return 0
+            rows = (legacy_row(row) for row in csv.reader(file) if len(row) >= min_columns)
+            added = conn.executemany(
+                'INSERT INTO students (name, age, gender, department, college, grade) VALUES (?, ?, ?, ?, ?, ?)',
+                (row for row in rows if row[0] and row[0] != 'Name')).rowcount
+            conn.execute('INSERT INTO imported_files (path, rows) VALUES (?, ?)', (os.path.abspath(path), added))
+        return added
+
+    def import_legacy_log(self, path=LEGACY_LOG, legacy_csv=LEGACY_CSV):
+        # One-time replay of texteditor's append-only log: "A,name,age,grade"
+        # adds a student, "D,name" deletes the ones with that name added so far.
+        # The log started as a copy of students.csv's first three columns; those
+        # copies of studentdata rows (gender read as grade) are skipped.
+        if not os.path.exists(path) or self._imported(path):
+            return 0
+        copies = Counter()
+        if os.path.exists(legacy_csv):
+            with open(legacy_csv, newline='', encoding='utf-8', errors='replace') as file:
+                copies.update(tuple(_clean(field) for field in row[:3]) for row in csv.reader(file) if len(row) >= 5)
+        added = 0
+        with open(path, newline='', encoding='utf-8', errors='replace') as file, self.transaction() as conn:
+            if self._imported(path):
+                return 0
+            first_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM students').fetchone()[0]
+            for row in csv.reader(file):
+                if len(row) >= 4 and row[0] == 'A':
+                    fields = tuple(_clean(field) for field in row[1:4])
+                    if copies[fields]:
+                        copies[fields] -= 1
+                        continue
+                    conn.execute('INSERT INTO students (name, age, grade) VALUES (?, ?, ?)',
+                                 (fields[0], _age(row[2]), fields[2]))
+                    added += 1
+                elif len(row) >= 2 and row[0] == 'D':
+                    added -= conn.execute('DELETE FROM students WHERE name=? AND id > ?',
+                                          (_clean(row[1]), first_id)).rowcount
+            conn.execute('INSERT INTO imported_files (path, rows) VALUES (?, ?)', (os.path.abspath(path), added))
+        return added
+
+
+def open_db(path=DB_NAME, durable=False):
+    # Opens the shared database, importing the legacy files the first time.
+    # When texteditor's log exists it already holds the CSV's Name,Age,Grade
+    # rows, so only the studentdata rows come from the CSV.
+    db = StudentDB(path, durable)
+    has_log = os.path.exists(LEGACY_LOG) and not db._imported(LEGACY_LOG)
+    db.import_legacy_csv(min_columns=5 if has_log else 3)
+    db.import_legacy_log()
+    return db
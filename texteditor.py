@@ -1,119 +1,750 @@
-import tkinter as tk
-from tkinter import messagebox
-import csv
-
-class StudentRecordApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Student Record Management")
-        self.root.geometry("500x400")
-
-        # Define file path for CSV
-        self.csv_file = "students.csv"
-
-        # Create UI elements
-        self.create_widgets()
-
-    def create_widgets(self):
-        # Labels
-        self.name_label = tk.Label(self.root, text="Name:")
-        self.name_label.grid(row=0, column=0, padx=10, pady=10)
-        
-        self.age_label = tk.Label(self.root, text="Age:")
-        self.age_label.grid(row=1, column=0, padx=10, pady=10)
-        
-        self.grade_label = tk.Label(self.root, text="Grade:")
-        self.grade_label.grid(row=2, column=0, padx=10, pady=10)
-
-        # Entry widgets
-        self.name_entry = tk.Entry(self.root)
-        self.name_entry.grid(row=0, column=1, padx=10, pady=10)
-        
-        self.age_entry = tk.Entry(self.root)
-        self.age_entry.grid(row=1, column=1, padx=10, pady=10)
-        
-        self.grade_entry = tk.Entry(self.root)
-        self.grade_entry.grid(row=2, column=1, padx=10, pady=10)
-
-        # Buttons
-        self.add_button = tk.Button(self.root, text="Add Student", command=self.add_student)
-        self.add_button.grid(row=3, column=0, padx=10, pady=10)
-        
-        self.show_button = tk.Button(self.root, text="Show Students", command=self.show_students)
-        self.show_button.grid(row=3, column=1, padx=10, pady=10)
-
-        self.delete_button = tk.Button(self.root, text="Delete Student", command=self.delete_student)
-        self.delete_button.grid(row=3, column=2, padx=10, pady=10)
-
-        # Listbox to display students
-        self.student_listbox = tk.Listbox(self.root, width=50, height=10)
-        self.student_listbox.grid(row=4, column=0, columnspan=3, padx=10, pady=10)
-
-    def add_student(self):
-        name = self.name_entry.get()
-        age = self.age_entry.get()
-        grade = self.grade_entry.get()
-
-        if not name or not age or not grade:
-            messagebox.showerror("Input Error", "All fields are required!")
-            return
-        
-        # Append the new student data to the CSV file
-        with open(self.csv_file, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerow([name, age, grade])
-        
-        # Clear the input fields
-        self.name_entry.delete(0, tk.END)
-        self.age_entry.delete(0, tk.END)
-        self.grade_entry.delete(0, tk.END)
-
-        messagebox.showinfo("Success", "Student added successfully!")
-
-    def show_students(self):
-        # Clear current listbox
-        self.student_listbox.delete(0, tk.END)
-
-        try:
-            with open(self.csv_file, mode="r") as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    self.student_listbox.insert(tk.END, f"Name: {row[0]}, Age: {row[1]}, Grade: {row[2]}")
-        except FileNotFoundError:
-            messagebox.showerror("File Not Found", "No student data file found. Please add a student first.")
-
-    def delete_student(self):
-        selected_student = self.student_listbox.curselection()
-
-        if not selected_student:
-            messagebox.showerror("Selection Error", "Please select a student to delete.")
-            return
-        
-        # Get the selected student data
-        selected_student_data = self.student_listbox.get(selected_student)
-        student_name = selected_student_data.split(",")[0].split(":")[1].strip()
-
-        # Read all students from the CSV file
-        students = []
-        with open(self.csv_file, mode="r") as file:
-            reader = csv.reader(file)
-            students = list(reader)
-
-        # Remove the student with the selected name
-        students = [student for student in students if student[0] != student_name]
-
-        # Write the updated students list back to the CSV
-        with open(self.csv_file, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerows(students)
-
-        # Refresh the student list
-        self.show_students()
-        messagebox.showinfo("Success", f"Student {student_name} deleted successfully!")
-
-# Create the main window
-root = tk.Tk()
-app = StudentRecordApp(root)
-
-# Start the Tkinter event loop
-root.mainloop()
+import tkinter as tk
+from tkinter import messagebox, ttk
+import bisect
+import mmap
+import os
+import random
+import sys
+from collections import namedtuple
+
+import students_db
+
+# Rows added to the listbox per after() tick while streaming
+SHOW_CHUNK = 2000
+# Bytes of the document held in the Text widget at a time
+WINDOW_BYTES = 256 * 1024
+# Largest slice copied at once when saving
+WRITE_CHUNK = 1024 * 1024
+
+# --- TEXT BUFFER ---
+
+# A piece is a run of bytes from one of the buffer's sources: the file on disk
+# (memory-mapped, never read as a whole) or the append-only buffer of typed text
+Piece = namedtuple('Piece', 'source start length')
+# One undoable change: at pos, the pieces that went in and the ones taken out
+Edit = namedtuple('Edit', 'pos inserted removed')
+
+class Node:
+    # Treap node holding one piece, ordered by position in the document.
+    # size is the byte length of the whole subtree, which is what lets every
+    # position lookup, split and merge run in O(log n) pieces.
+    __slots__ = ('source', 'start', 'length', 'priority', 'left', 'right', 'size')
+
+    def __init__(self, source, start, length):
+        self.source = source
+        self.start = start
+        self.length = length
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.size = length
+
+def _size(node):
+    return node.size if node is not None else 0
+
+def _update(node):
+    node.size = node.length + _size(node.left) + _size(node.right)
+    return node
+
+def _merge(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        a.right = _merge(a.right, b)
+        return _update(a)
+    b.left = _merge(a, b.left)
+    return _update(b)
+
+def _split(node, pos):
+    # (first pos bytes, the rest), cutting the piece that straddles pos
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if pos <= left_size:
+        left, node.left = _split(node.left, pos)
+        return left, _update(node)
+    if pos >= left_size + node.length:
+        node.right, right = _split(node.right, pos - left_size - node.length)
+        return _update(node), right
+    cut = pos - left_size
+    tail = Node(node.source, node.start + cut, node.length - cut)
+    right, node.right = node.right, None
+    node.length = cut
+    return _update(node), _merge(tail, right)
+
+def _last(node):
+    while node is not None and node.right is not None:
+        node = node.right
+    return node
+
+def _grow_last(node, extra):
+    # Lengthen the last piece in place, fixing sizes on the way back up
+    if node.right is not None:
+        _grow_last(node.right, extra)
+    else:
+        node.length += extra
+    _update(node)
+
+def _pieces(node):
+    # In-order walk with an explicit stack
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield Piece(node.source, node.start, node.length)
+        node = node.right
+
+class TextBuffer:
+    # Piece table over a treap. Opening a file only maps it; bytes are read
+    # when a range is asked for. Inserts append to the add buffer and splice
+    # in a piece, deletes cut pieces out, both in O(log n). Undo and redo
+    # replay Edits, which only hold piece references, never text snapshots.
+    def __init__(self, data=b'', path=None):
+        self.sources = [data, bytearray()]
+        self.original = 0
+        self.added = 1
+        self.root = Node(self.original, 0, len(data)) if len(data) else None
+        self.path = path
+        self.file = None
+        self.undo_stack = []
+        self.redo_stack = []
+        self.modified = False
+
+    @classmethod
+    def open(cls, path):
+        if not os.path.exists(path):
+            return cls(path=path)
+        file = open(path, 'rb')
+        size = os.fstat(file.fileno()).st_size
+        buffer = cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b'', path)
+        buffer.file = file
+        return buffer
+
+    def close(self):
+        for source in self.sources:
+            if isinstance(source, mmap.mmap):
+                source.close()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __len__(self):
+        return _size(self.root)
+
+    def pieces(self):
+        return _pieces(self.root)
+
+    # --- READING ---
+
+    def read(self, pos, length):
+        out = []
+        self._read(self.root, pos, min(pos + length, len(self)), out)
+        return b''.join(out)
+
+    def _read(self, node, lo, hi, out):
+        # Collect the bytes of [lo, hi) of this subtree, skipping subtrees outside it
+        if node is None or lo >= hi:
+            return
+        left = _size(node.left)
+        if lo < left:
+            self._read(node.left, lo, min(hi, left), out)
+        start, end = max(lo, left), min(hi, left + node.length)
+        if start < end:
+            out.append(self.sources[node.source][node.start + start - left:node.start + end - left])
+        if hi > left + node.length:
+            self._read(node.right, max(lo - left - node.length, 0), hi - left - node.length, out)
+
+    def chunks(self, size=WRITE_CHUNK):
+        for source, start, length in self.pieces():
+            for offset in range(start, start + length, size):
+                yield self.sources[source][offset:min(offset + size, start + length)]
+
+    def line_start(self, pos, limit=WINDOW_BYTES):
+        # Start of the line holding pos, looking back at most limit bytes
+        lo = max(0, pos - limit)
+        found = self.read(lo, pos - lo).rfind(b'\n')
+        return lo + found + 1 if found >= 0 else lo
+
+    def line_end(self, pos, limit=WINDOW_BYTES):
+        # Position just past the next newline at or after pos
+        data = self.read(pos, limit)
+        found = data.find(b'\n')
+        return pos + found + 1 if found >= 0 else pos + len(data)
+
+    # --- EDITING ---
+
+    def _splice(self, pos, remove, pieces):
+        # Take remove bytes out at pos, put pieces in; returns what came out
+        left, rest = _split(self.root, pos)
+        middle, right = _split(rest, remove)
+        for source, start, length in pieces:
+            left = _merge(left, Node(source, start, length))
+        self.root = _merge(left, right)
+        return tuple(_pieces(middle))
+
+    def _record(self, edit):
+        self.redo_stack.clear()
+        self.modified = True
+        previous = self.undo_stack[-1] if self.undo_stack else None
+        # Typing, backspacing or deleting in one place is a single undo step
+        if previous is not None and not previous.removed and not edit.removed and \
+                previous.pos + sum(p.length for p in previous.inserted) == edit.pos:
+            last, piece = previous.inserted[-1], edit.inserted[0]
+            if last.source == piece.source and last.start + last.length == piece.start:
+                inserted = previous.inserted[:-1] + (Piece(last.source, last.start, last.length + piece.length),)
+            else:
+                inserted = previous.inserted + edit.inserted
+            self.undo_stack[-1] = Edit(previous.pos, inserted, ())
+        elif previous is not None and not previous.inserted and not edit.inserted and \
+                edit.pos + sum(p.length for p in edit.removed) == previous.pos:
+            self.undo_stack[-1] = Edit(edit.pos, (), edit.removed + previous.removed)
+        elif previous is not None and not previous.inserted and not edit.inserted and edit.pos == previous.pos:
+            self.undo_stack[-1] = Edit(edit.pos, (), previous.removed + edit.removed)
+        else:
+            self.undo_stack.append(edit)
+
+    def insert(self, pos, data):
+        if not data:
+            return
+        added = self.sources[self.added]
+        start = len(added)
+        added += data
+        left, right = _split(self.root, pos)
+        last = _last(left)
+        if last is not None and last.source == self.added and last.start + last.length == start:
+            # Continuing to type where the last insert ended
+            _grow_last(left, len(data))
+        else:
+            left = _merge(left, Node(self.added, start, len(data)))
+        self.root = _merge(left, right)
+        self._record(Edit(pos, (Piece(self.added, start, len(data)),), ()))
+
+    def delete(self, pos, length):
+        length = min(length, len(self) - pos)
+        if length <= 0:
+            return
+        self._record(Edit(pos, (), self._splice(pos, length, ())))
+
+    def undo(self):
+        # Returns where the change happened, or None if there is nothing to undo
+        if not self.undo_stack:
+            return None
+        edit = self.undo_stack.pop()
+        self._splice(edit.pos, sum(p.length for p in edit.inserted), edit.removed)
+        self.redo_stack.append(edit)
+        self.modified = True
+        return edit.pos
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        edit = self.redo_stack.pop()
+        self._splice(edit.pos, sum(p.length for p in edit.removed), edit.inserted)
+        self.undo_stack.append(edit)
+        self.modified = True
+        return edit.pos
+
+    # --- SAVING ---
+
+    def save(self, path=None):
+        # Writes only the changed regions when every piece of the file is
+        # still at its own offset (overwrites, appends, cuts at the end).
+        # Anything that shifts file content is a streamed rewrite to a
+        # temporary file, renamed over the original. Returns (how, bytes written).
+        path = path or self.path
+        regions = self._changed_regions() if path == self.path and self.file is not None else None
+        if regions is None:
+            written = self._rewrite(path)
+            how = "rewritten"
+        else:
+            written = self._write_in_place(regions)
+            how = "in place"
+        self.modified = False
+        return how, written
+
+    def _changed_regions(self):
+        # [(offset, piece)] to write, or None if file content would move
+        regions = []
+        offset = 0
+        for piece in self.pieces():
+            if piece.source == self.original:
+                if piece.start != offset:
+                    return None
+            else:
+                regions.append((offset, piece))
+            offset += piece.length
+        return regions
+
+    def _write_in_place(self, regions):
+        size = len(self)
+        old_size = len(self.sources[self.original])
+        changed = [(offset, offset + piece.length) for offset, piece in regions]
+        if size < old_size:
+            changed.append((size, old_size))
+        self._keep_history(changed)
+        # The regions all come from the add buffer. Unmap the file first,
+        # Windows refuses to truncate a mapped file.
+        self.close()
+        written = 0
+        try:
+            with open(self.path, 'r+b') as file:
+                for offset, piece in regions:
+                    file.seek(offset)
+                    source = self.sources[piece.source]
+                    for start in range(piece.start, piece.start + piece.length, WRITE_CHUNK):
+                        written += file.write(source[start:min(start + WRITE_CHUNK, piece.start + piece.length)])
+                file.truncate(size)
+                file.flush()
+                os.fsync(file.fileno())
+        except BaseException:
+            self._map()
+            raise
+        self._reopen()
+        return written
+
+    def _keep_history(self, changed=None):
+        # Undo entries may point at file bytes about to be overwritten, or at
+        # any of them when the whole file is replaced (changed=None); copy
+        # those pieces into the add buffer first
+        if changed is not None:
+            changed.sort()
+            starts = [lo for lo, hi in changed]
+        added = self.sources[self.added]
+
+        def keep(piece):
+            if piece.source != self.original:
+                return piece
+            if changed is not None:
+                # The regions are disjoint, only the last one starting before
+                # the piece ends can overlap it
+                i = bisect.bisect_left(starts, piece.start + piece.length)
+                if i == 0 or changed[i - 1][1] <= piece.start:
+                    return piece
+            start = len(added)
+            added.extend(self.sources[self.original][piece.start:piece.start + piece.length])
+            return Piece(self.added, start, piece.length)
+
+        for stack in (self.undo_stack, self.redo_stack):
+            stack[:] = [Edit(edit.pos, tuple(map(keep, edit.inserted)), tuple(map(keep, edit.removed)))
+                        for edit in stack]
+
+    def _rewrite(self, path):
+        tmp_path = path + '.tmp'
+        written = 0
+        with open(tmp_path, 'wb') as file:
+            for chunk in self.chunks():
+                written += file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+        # Undo must not need the old file any more, and it has to be unmapped
+        # and closed before Windows lets it be replaced
+        self._keep_history()
+        mapped = self.file is not None
+        self.close()
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            if mapped:
+                self._map()
+            raise
+        self.path = path
+        self._reopen()
+        return written
+
+    def _map(self):
+        # Open and map the file at self.path as the original source
+        self.file = open(self.path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.sources[self.original] = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        return size
+
+    def _reopen(self):
+        # Map the saved file and make it the whole document
+        size = self._map()
+        self.root = Node(self.original, 0, size) if size else None
+
+# --- EDITOR ---
+
+class TextEditor:
+    # The Text widget holds a window of about WINDOW_BYTES of the document,
+    # cut at line boundaries, and the window moves as you scroll. Every insert
+    # and delete the widget makes is mirrored into the TextBuffer, which is
+    # what gets saved, undone and redone.
+    def __init__(self, root, path):
+        self.root = root
+        self.buffer = TextBuffer.open(path)
+        self.top = 0
+        self.window_len = 0
+        self.ascii = True
+        self.readonly = False
+        self.loading = False
+        self.shifting = None
+
+        self.text = tk.Text(root, wrap="none", undo=False)
+        self.scrollbar = ttk.Scrollbar(root, orient="vertical", command=self.scroll)
+        self.status = tk.Label(root, text="", anchor="w")
+        self.status.pack(side="bottom", fill="x")
+        self.scrollbar.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.configure(yscrollcommand=self.on_view_changed)
+
+        # Route the widget's own insert/delete calls through a Tcl proc that
+        # runs the real widget command and mirrors the edit only once it has
+        # succeeded. Errors stay on the Tcl side, so the catch in Tk's own
+        # bindings (Ctrl+C with no selection) still works.
+        self.widget_command = self.text._w + "_widget"
+        self.pending = None
+        root.tk.call("rename", self.text._w, self.widget_command)
+        root.tk.createcommand(self.text._w + "_prepare", self.prepare)
+        root.tk.createcommand(self.text._w + "_commit", self.commit)
+        root.tk.call("proc", self.text._w, "args", f"""
+            if {{[lindex $args 0] ni {{insert delete replace}}}} {{
+                return [{self.widget_command} {{*}}$args]
+            }}
+            {self.text._w}_prepare {{*}}$args
+            set result [{self.widget_command} {{*}}$args]
+            {self.text._w}_commit
+            return $result
+        """)
+
+        for sequence, handler in (("<Control-s>", self.save), ("<Control-z>", self.undo),
+                                  ("<Control-y>", self.redo), ("<Control-Z>", self.redo),
+                                  ("<Control-Home>", lambda e: self.jump(0)),
+                                  ("<Control-End>", lambda e: self.jump(len(self.buffer)))):
+            self.text.bind(sequence, handler)
+        root.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.load_window(0)
+        self.update_title()
+
+    def call(self, *args):
+        return self.root.tk.call((self.widget_command,) + args)
+
+    # --- WINDOW ---
+
+    def load_window(self, pos, cursor=None, view=None):
+        # Show the lines around pos; put the cursor and the first visible line
+        # back at the given document offsets if they are inside the window
+        size = len(self.buffer)
+        self.top = self.buffer.line_start(min(pos, size))
+        end = self.buffer.line_end(min(self.top + WINDOW_BYTES, size)) if self.top + WINDOW_BYTES < size else size
+        data = self.buffer.read(self.top, end - self.top)
+        self.window_len = len(data)
+        self.ascii = data.isascii()
+        text = data.decode("utf-8", errors="replace")
+        # Bytes that are not valid UTF-8 could not be saved back unchanged
+        self.readonly = readonly = not self.ascii and text.encode("utf-8") != data
+
+        self.loading = True
+        try:
+            self.text.configure(state="normal")
+            self.call("delete", "1.0", "end")
+            self.call("insert", "1.0", text)
+            if readonly:
+                self.text.configure(state="disabled")
+        finally:
+            self.loading = False
+        self.call("mark", "set", "insert", self.index_of(cursor if cursor is not None else pos))
+        if view is not None:
+            self.call("yview", self.index_of(view))
+        self.call("see", "insert")
+        if readonly:
+            self.show_status("Read-only here: this part of the file is not valid UTF-8")
+
+    def index_of(self, pos):
+        # Text index of a document offset inside the window
+        pos = min(max(pos, self.top), self.top + self.window_len)
+        before = self.buffer.read(self.top, pos - self.top).decode("utf-8", errors="replace")
+        line = before.count("\n") + 1
+        column = len(before) - before.rfind("\n") - 1
+        return f"{line}.{column}"
+
+    def offset_of(self, index):
+        # Document offset of a Text index
+        index = self.call("index", index)
+        if self.call("compare", index, ">", "end-1c"):
+            index = self.call("index", "end-1c")
+        if self.ascii:
+            return self.top + int(self.call("count", "-chars", "1.0", index) or 0)
+        return self.top + len(self.call("get", "1.0", index).encode("utf-8"))
+
+    def jump(self, pos):
+        self.load_window(max(0, pos - WINDOW_BYTES // 2), cursor=pos)
+        return "break"
+
+    def on_view_changed(self, first, last):
+        # Map the window's scroll position onto the whole document
+        size = len(self.buffer) or 1
+        first, last = float(first), float(last)
+        self.scrollbar.set((self.top + first * self.window_len) / size, (self.top + last * self.window_len) / size)
+        at_end = last >= 1.0 and self.top + self.window_len < len(self.buffer)
+        at_start = first <= 0.0 and self.top > 0
+        if (at_end or at_start) and self.shifting is None:
+            self.shifting = self.root.after_idle(self.shift_window)
+
+    def shift_window(self):
+        # Recenter the window on what is on screen, keeping cursor and view
+        self.shifting = None
+        view = self.offset_of("@0,0")
+        cursor = self.offset_of("insert")
+        self.load_window(max(0, view - WINDOW_BYTES // 2), cursor=cursor, view=view)
+
+    def scroll(self, *args):
+        if args[0] == "moveto":
+            target = int(float(args[1]) * len(self.buffer))
+            if self.top <= target < self.top + self.window_len:
+                self.call("yview", "moveto", (target - self.top) / max(self.window_len, 1))
+            else:
+                self.load_window(target, view=target)
+        else:
+            self.call("yview", *args)
+
+    # --- EDITING ---
+
+    def prepare(self, command, *args):
+        # Called before the widget runs an insert, delete or replace: works out
+        # the document edit while the old text is still there. Must not raise,
+        # a bad index fails the widget command itself right after.
+        self.pending = None
+        if self.loading or self.readonly:
+            return
+        try:
+            self.pending = self.plan(command, args)
+        except tk.TclError:
+            pass
+
+    def plan(self, command, args):
+        removed = None
+        if command in ("delete", "replace"):
+            start = self.call("index", args[0])
+            end = self.call("index", args[1] if len(args) > 1 else f"{start}+1c")
+            if self.call("compare", end, ">", "end-1c"):
+                end = self.call("index", "end-1c")
+            if self.call("compare", start, "<", end):
+                removed = (self.offset_of(start), len(self.call("get", start, end).encode("utf-8")))
+        chars = None
+        if command == "insert":
+            chars = "".join(args[1::2])
+        elif command == "replace":
+            chars = "".join(args[2::2])
+        return removed, self.offset_of(args[0]), chars
+
+    def commit(self):
+        # Called once the widget command succeeded
+        edit, self.pending = self.pending, None
+        if edit is None:
+            return
+        removed, pos, chars = edit
+        if removed:
+            self.buffer.delete(*removed)
+            self.window_len -= removed[1]
+        if chars:
+            data = chars.encode("utf-8")
+            self.buffer.insert(pos, data)
+            self.window_len += len(data)
+            self.ascii = self.ascii and chars.isascii()
+        self.update_title()
+
+    def undo(self, event=None):
+        self.restore(self.buffer.undo())
+        return "break"
+
+    def redo(self, event=None):
+        self.restore(self.buffer.redo())
+        return "break"
+
+    def restore(self, pos):
+        if pos is None:
+            self.root.bell()
+            return
+        view = self.offset_of("@0,0")
+        self.load_window(min(view, pos), cursor=pos, view=view if view <= pos else pos)
+        self.update_title()
+
+    # --- FILE ---
+
+    def save(self, event=None):
+        try:
+            how, written = self.buffer.save()
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Could not save {self.buffer.path}: {e}")
+            return "break"
+        self.show_status(f"Saved {how}, {written} bytes written")
+        self.update_title()
+        return "break"
+
+    def update_title(self):
+        mark = "*" if self.buffer.modified else ""
+        self.root.title(f"{mark}{os.path.basename(self.buffer.path)} ({len(self.buffer)} bytes)")
+
+    def show_status(self, message):
+        self.status.configure(text=message)
+
+    def close(self):
+        if self.buffer.modified:
+            answer = messagebox.askyesnocancel("Unsaved Changes", "Save changes before closing?")
+            if answer is None:
+                return
+            if answer:
+                self.save()
+        self.buffer.close()
+        self.root.destroy()
+
+# --- STUDENT RECORDS ---
+
+def format_student(student):
+    text = f"Name: {student.name}, Age: {student.age}, Grade: {student.grade or '-'}"
+    # Students entered in studentdata.py have a department instead of a grade
+    if student.department:
+        text += f", Department: {student.department}"
+    return text
+
+class StudentRecordApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Student Record Management")
+        self.root.geometry("500x400")
+
+        # Student records are shared with studentdata.py in students.db
+        self.store = students_db.open_db()
+        self.shown = []
+        self.stream = None
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Create UI elements
+        self.create_widgets()
+
+    def create_widgets(self):
+        # Labels
+        self.name_label = tk.Label(self.root, text="Name:")
+        self.name_label.grid(row=0, column=0, padx=10, pady=10)
+        
+        self.age_label = tk.Label(self.root, text="Age:")
+        self.age_label.grid(row=1, column=0, padx=10, pady=10)
+        
+        self.grade_label = tk.Label(self.root, text="Grade:")
+        self.grade_label.grid(row=2, column=0, padx=10, pady=10)
+
+        # Entry widgets
+        self.name_entry = tk.Entry(self.root)
+        self.name_entry.grid(row=0, column=1, padx=10, pady=10)
+        
+        self.age_entry = tk.Entry(self.root)
+        self.age_entry.grid(row=1, column=1, padx=10, pady=10)
+        
+        self.grade_entry = tk.Entry(self.root)
+        self.grade_entry.grid(row=2, column=1, padx=10, pady=10)
+
+        # Buttons
+        self.add_button = tk.Button(self.root, text="Add Student", command=self.add_student)
+        self.add_button.grid(row=3, column=0, padx=10, pady=10)
+        
+        self.show_button = tk.Button(self.root, text="Show Students", command=self.show_students)
+        self.show_button.grid(row=3, column=1, padx=10, pady=10)
+
+        self.delete_button = tk.Button(self.root, text="Delete Student", command=self.delete_student)
+        self.delete_button.grid(row=3, column=2, padx=10, pady=10)
+
+        # Listbox to display students
+        self.student_listbox = tk.Listbox(self.root, width=50, height=10)
+        self.student_listbox.grid(row=4, column=0, columnspan=3, padx=10, pady=10)
+
+        # Progress while a large roster is streamed into the listbox
+        self.progress = ttk.Progressbar(self.root, length=300, mode="determinate")
+        self.progress.grid(row=5, column=0, columnspan=2, padx=10, sticky="w")
+        self.progress_label = tk.Label(self.root, text="")
+        self.progress_label.grid(row=5, column=2, padx=10)
+
+    def add_student(self):
+        name = self.name_entry.get()
+        age = self.age_entry.get()
+        grade = self.grade_entry.get()
+
+        if not name or not age or not grade:
+            messagebox.showerror("Input Error", "All fields are required!")
+            return
+        if not age.isdigit() or int(age) <= 0:
+            messagebox.showerror("Input Error", "Age must be a positive whole number!")
+            return
+        
+        self.store.add(name, age, grade=grade)
+        
+        # Clear the input fields
+        self.name_entry.delete(0, tk.END)
+        self.age_entry.delete(0, tk.END)
+        self.grade_entry.delete(0, tk.END)
+
+        messagebox.showinfo("Success", "Student added successfully!")
+
+    def show_students(self):
+        # Clear current listbox, stopping a stream that is still running
+        if self.stream is not None:
+            self.root.after_cancel(self.stream)
+        self.student_listbox.delete(0, tk.END)
+        self.shown = []
+
+        # Rows arrive a chunk per after() tick, so the window stays responsive
+        total = self.store.count()
+        self.progress.configure(maximum=max(total, 1), value=0)
+        self.progress_label.configure(text=f"0 / {total}")
+        self.stream = self.root.after(0, self.show_chunk, self.store.scan(SHOW_CHUNK), total)
+
+    def show_chunk(self, chunks, total):
+        chunk = next(chunks, None)
+        if chunk is None:
+            self.stream = None
+            self.progress_label.configure(text=f"{len(self.shown)} students")
+            return
+        self.shown.extend(chunk)
+        self.student_listbox.insert(tk.END, *map(format_student, chunk))
+        self.progress.configure(value=len(self.shown))
+        self.progress_label.configure(text=f"{len(self.shown)} / {total}")
+        self.stream = self.root.after(1, self.show_chunk, chunks, total)
+
+    def delete_student(self):
+        selected_student = self.student_listbox.curselection()
+
+        if not selected_student:
+            messagebox.showerror("Selection Error", "Please select a student to delete.")
+            return
+
+        # Delete the selected record by id, an indexed single-row delete
+        index = selected_student[0]
+        student = self.shown[index]
+        student_name = student.name
+        self.store.delete(student.id)
+
+        # Drop just that row; a stream still running appends after it
+        self.student_listbox.delete(index)
+        del self.shown[index]
+        if self.stream is None:
+            self.progress_label.configure(text=f"{len(self.shown)} students")
+        messagebox.showinfo("Success", f"Student {student_name} deleted successfully!")
+
+    def close(self):
+        if self.stream is not None:
+            self.root.after_cancel(self.stream)
+        self.store.close()
+        self.root.destroy()
+
+def main(argv=None):
+    # "python texteditor.py FILE" edits FILE, without arguments the student app runs
+    argv = sys.argv[1:] if argv is None else argv
+
+    # Create the main window
+    root = tk.Tk()
+    if argv:
+        root.geometry("900x600")
+        app = TextEditor(root, argv[0])
+    else:
+        app = StudentRecordApp(root)
+
+    # Start the Tkinter event loop
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()